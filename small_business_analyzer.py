@@ -1,26 +1,194 @@
 import PyPDF2
+import pymupdf
+import ahocorasick
 import re
-from typing import Dict, List, Any, Optional
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple, Union
 import io
+from dataclasses import dataclass, field
+
+# 解析結果キャッシュの最大保持件数
+_ANALYSIS_CACHE_SIZE = 32
+
+# PyMuPDFはスレッドセーフではないため、セッションごとのスレッドからの呼び出しを直列化
+_PYMUPDF_LOCK = threading.Lock()
+
+# 各パターンは「語句→最初の数字→単位」を行内で1方向に読み進め、語句間の隔たりを40文字までに制限して長い1行でのバックトラックを避ける
+
+# 企業情報
+_COMPANY_RE = re.compile(r'(株式会社|有限会社|合同会社|個人事業主)\s*([^\s\n]+)')
+_REP_RE = re.compile(r'代表者[^\S\n]*([^\s\n]+)')
+_EMP_RE = re.compile(r'従業員[^\d\n]{0,40}(\d+)(?!\d)[^\n]{0,40}?人')
+_CAPITAL_RE = re.compile(r'資本金[^\d\n]{0,40}(\d+)(?!\d)[^\n]{0,40}?万円')
+_EST_RE = re.compile(r'設立[^\n]{0,40}?(\d{4})年')
+
+# 売上・利益・成長率（先読みで各パターンの一致を1回の走査でまとめて取得）
+_FINANCIAL_RE = re.compile(
+    r'(?=\d{4}年|売上|利益|前年比|増加|減少|成長)'
+    r'(?=(?P<year_sales>(?P<ys_year>\d{4})年[^\n]{0,40}?売上[^\d\n]{0,40}(?P<ys_amount>\d{1,3}(?:,\d{3})*|\d+)[^\n]{0,40}?(?P<ys_unit>[万千億]円)))?'
+    r'(?=(?P<year_amount>(?P<ya_year>\d{4})年[^\d\n]{0,40}(?P<ya_amount>\d{1,3}(?:,\d{3})*|\d+)[^\n]{0,40}?(?P<ya_unit>[万千億]円)))?'
+    r'(?=(?P<sales>売上[^\d\n]{0,40}(?P<s_amount>\d{1,3}(?:,\d{3})*|\d+)[^\n]{0,40}?(?P<s_unit>[万千億]円)))?'
+    r'(?=(?P<profit>利益[^\d\n]{0,40}(?P<p_amount>\d{1,3}(?:,\d{3})*|\d+)[^\n]{0,40}?(?P<p_unit>[万千億]円)))?'
+    r'(?=(?P<growth>(?P<g_type>前年比|増加|減少|成長)[^\d\n]{0,40}(?P<g_rate>\d+)(?!\d)[^\n]{0,40}?%))?'
+)
+_FINANCIAL_FIELDS = {
+    'year_sales': ('ys_year', 'ys_amount', 'ys_unit'),
+    'year_amount': ('ya_year', 'ya_amount', 'ya_unit'),
+    'sales': ('s_amount', 's_unit'),
+    'profit': ('p_amount', 'p_unit'),
+    'growth': ('g_type', 'g_rate')
+}
+
+# 市場・事業計画
+_MARKET_SIZE_RE = re.compile(r'市場[^\d\n]{0,40}(\d+)(?!\d)[^\n]{0,40}?([億万兆]円)')
+_NUMERICAL_TGT_RE = re.compile(r'(売上|顧客|集客|利益)[^\d\n]{0,40}(\d+)(?!\d)[^\n]{0,40}?([万千億]円|人|件)')
+_TIMELINE_RE = re.compile(r'\d{4}年|\d+月|\d+年後')
+_EFFECT_RE = re.compile(r'効果[^\d\n]{0,40}(\d+)(?!\d)[^\n]{0,40}?(万円|人|件|%)')
+
+# 金額トークン（経費明細・具体的表現で共用）
+_AMOUNT_UNIT_RE = re.compile(r'(?<!\d)(\d{1,3}(?:,\d{3})*|\d+)(\s*)([万千億]?円)')
+# 経費項目名（金額直前の数字・改行を含まない40文字まで）
+_COST_LABEL_RE = re.compile(r'[^\d\n]{1,40}\Z')
+
+# コンテンツ品質
+_DIGITS_RE = re.compile(r'\d+')
+_YM_RE = re.compile(r'\d+年\d+月')
+_NIN_RE = re.compile(r'\d+人')
+
+# テキストクリーニング
+_CTRL_TABLE = dict.fromkeys(
+    list(range(0x00, 0x09)) + [0x0b, 0x0c] + list(range(0x0e, 0x20)) + list(range(0x7f, 0xa0))
+)
+_WS_RE = re.compile(r'(\n)\n+|( ) +')
+
+@dataclass(slots=True)
+class SalesEntry:
+    """売上記載（年度なしの場合はyearがNone）"""
+    year: Optional[int]
+    amount: str
+    unit: str
+
+@dataclass(slots=True)
+class ProfitEntry:
+    """利益記載"""
+    amount: str
+    unit: str
+
+@dataclass(slots=True)
+class GrowthRate:
+    """成長率記載"""
+    type: str
+    rate: float
+
+@dataclass(slots=True)
+class CostItem:
+    """経費項目"""
+    item: str
+    amount: str
+
+@dataclass(slots=True)
+class CompanyInfo:
+    """企業情報"""
+    company_name: Optional[str] = None
+    representative: Optional[str] = None
+    employees: Optional[int] = None
+    capital: Optional[int] = None
+    established: Optional[int] = None
+    sales: List[SalesEntry] = field(default_factory=list)
+
+@dataclass(slots=True)
+class FinancialData:
+    """財務データ"""
+    sales_history: List[SalesEntry] = field(default_factory=list)
+    profit_data: List[ProfitEntry] = field(default_factory=list)
+    growth_rates: List[GrowthRate] = field(default_factory=list)
+    financial_indicators: List[Dict[str, Any]] = field(default_factory=list)
+
+@dataclass(slots=True)
+class MarketAnalysis:
+    """市場分析内容"""
+    keyword_matches: List[str] = field(default_factory=list)
+    market_size_mentions: List[tuple] = field(default_factory=list)
+    competitor_analysis: bool = False
+    customer_needs: bool = False
+    market_trends: bool = False
+
+@dataclass(slots=True)
+class StrengthsWeaknesses:
+    """強み・弱み分析"""
+    strengths_mentioned: List[str] = field(default_factory=list)
+    weaknesses_mentioned: List[str] = field(default_factory=list)
+    differentiation: bool = False
+    competitive_advantage: bool = False
+
+@dataclass(slots=True)
+class BusinessPlan:
+    """事業計画"""
+    goals_mentioned: List[str] = field(default_factory=list)
+    numerical_targets: List[tuple] = field(default_factory=list)
+    timeline: List[str] = field(default_factory=list)
+    strategies: List[str] = field(default_factory=list)
+    implementation_plan: bool = False
+
+@dataclass(slots=True)
+class SubsidyPlan:
+    """補助事業計画"""
+    subsidy_items: List[str] = field(default_factory=list)
+    sales_development: bool = False
+    efficiency_improvement: bool = False
+    digital_utilization: bool = False
+    expected_effects: List[tuple] = field(default_factory=list)
+
+@dataclass(slots=True)
+class CostBreakdown:
+    """経費明細"""
+    total_cost: Optional[str] = None
+    subsidy_amount: Optional[str] = None
+    self_funding: Optional[str] = None
+    cost_items: List[CostItem] = field(default_factory=list)
+
+@dataclass(slots=True)
+class BonusIndicators:
+    """加点指標"""
+    detected_bonuses: List[str] = field(default_factory=list)
+    priority_bonus: bool = False
+    policy_bonus: bool = False
+
+@dataclass(slots=True)
+class ContentQuality:
+    """コンテンツ品質"""
+    text_length: int = 0
+    paragraph_count: int = 0
+    numerical_data_count: int = 0
+    concrete_expressions: int = 0
+    quality_score: float = 0.0
 
 class SmallBusinessAnalyzer:
     """小規模事業者持続化補助金申請書類の解析クラス"""
     
     def __init__(self):
         self.analysis_patterns = self._initialize_analysis_patterns()
+        self.keyword_automaton, self.ascii_keyword_pattern, self.ascii_keywords = self._build_keyword_matchers()
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()  # 複数セッションで共有される場合の排他
     
     def _initialize_analysis_patterns(self) -> Dict[str, Any]:
         """解析パターンの初期化"""
         return {
             'company_info': {
                 'patterns': [
-                    r'(株式会社|有限会社|合同会社|個人事業主).*?([^\s]+)',
-                    r'代表者.*?([^\s]+)',
-                    r'従業員.*?(\d+).*?人',
-                    r'資本金.*?(\d+).*?万円',
-                    r'設立.*?(\d{4})年',
-                    r'売上.*?(\d+).*?(万円|千円|億円)'
-                ]
+                    re.compile(r'(株式会社|有限会社|合同会社|個人事業主).*?([^\s]+)'),
+                    re.compile(r'代表者.*?([^\s]+)'),
+                    re.compile(r'従業員.*?(\d+).*?人'),
+                    re.compile(r'資本金.*?(\d+).*?万円'),
+                    re.compile(r'設立.*?(\d{4})年'),
+                    re.compile(r'売上.*?(\d+).*?(万円|千円|億円)')
+                ],
+                'company_type_keywords': frozenset({'株式会社', '有限会社', '合同会社', '個人事業主'}),
+                'field_keywords': ['代表者', '従業員', '資本金', '設立']
             },
             'business_content': {
                 'keywords': [
@@ -30,44 +198,58 @@ class SmallBusinessAnalyzer:
             },
             'financial_data': {
                 'patterns': [
-                    r'売上.*?(\d{1,3}(?:,\d{3})*|\d+).*?(万円|千円|億円)',
-                    r'利益.*?(\d{1,3}(?:,\d{3})*|\d+).*?(万円|千円|億円)',
-                    r'(\d{4})年.*?(\d{1,3}(?:,\d{3})*|\d+).*?(万円|千円|億円)',
-                    r'前年比.*?(\d+).*?%',
-                    r'増加.*?(\d+).*?%',
-                    r'減少.*?(\d+).*?%'
+                    re.compile(r'売上.*?(\d{1,3}(?:,\d{3})*|\d+).*?(万円|千円|億円)'),
+                    re.compile(r'利益.*?(\d{1,3}(?:,\d{3})*|\d+).*?(万円|千円|億円)'),
+                    re.compile(r'(\d{4})年.*?(\d{1,3}(?:,\d{3})*|\d+).*?(万円|千円|億円)'),
+                    re.compile(r'前年比.*?(\d+).*?%'),
+                    re.compile(r'増加.*?(\d+).*?%'),
+                    re.compile(r'減少.*?(\d+).*?%')
                 ]
             },
             'market_analysis': {
                 'keywords': [
                     '市場', '競合', '顧客ニーズ', '業界動向', 'ライバル', 'シェア',
                     '需要', '供給', 'トレンド', '成長', '縮小', '変化'
-                ]
+                ],
+                'competitor_keywords': frozenset({'競合', 'ライバル', '他社', '同業'}),
+                'customer_keywords': frozenset({'顧客ニーズ', 'お客様', '利用者', 'ユーザー'}),
+                'trend_keywords': frozenset({'トレンド', '動向', '変化', '成長', '拡大'})
             },
             'strengths_weaknesses': {
                 'keywords': [
                     '強み', '弱み', '優位性', '特徴', '差別化', '課題', '問題点',
                     '改善', '解決', '対策', '独自', '他社にない'
-                ]
+                ],
+                'strength_keywords': ['強み', '優位性', '特徴', '差別化', '独自', '他社にない'],
+                'weakness_keywords': ['弱み', '課題', '問題', '改善', '不足'],
+                'diff_keywords': frozenset({'差別化', '独自', '他社との違い', 'オリジナル'}),
+                'advantage_keywords': frozenset({'優位性', 'アドバンテージ', '競争力', '強み'})
             },
             'business_plan': {
                 'keywords': [
                     '計画', '目標', '方針', '戦略', '取組', '実施', '予定',
                     '新規', '開拓', '拡大', '改善', '効率', 'デジタル'
-                ]
+                ],
+                'goal_keywords': ['目標', '計画', '予定', '方針', '戦略'],
+                'implementation_keywords': frozenset({'実施', '開始', '完了', '段階', 'ステップ', 'スケジュール'}),
+                'target_keywords': frozenset({'売上', '顧客', '集客', '利益'})
             },
             'subsidy_plan': {
                 'keywords': [
                     '補助事業', '販路開拓', '業務効率', 'ホームページ', 'チラシ',
                     '看板', '設備', '機械', 'システム', '広告', 'PR'
-                ]
+                ],
+                'sales_keywords': frozenset({'販路', '新規', '開拓', '顧客獲得', '営業'}),
+                'efficiency_keywords': frozenset({'効率', '省力', '自動', '時短', '合理化'}),
+                'digital_keywords': frozenset({'デジタル', 'it', 'ホームページ', 'sns', 'システム', 'dx'}),
+                'effect_keywords': frozenset({'効果'})
             },
             'cost_breakdown': {
                 'patterns': [
-                    r'(\w+).*?(\d{1,3}(?:,\d{3})*|\d+).*?円',
-                    r'合計.*?(\d{1,3}(?:,\d{3})*|\d+).*?円',
-                    r'補助.*?(\d{1,3}(?:,\d{3})*|\d+).*?円',
-                    r'自己資金.*?(\d{1,3}(?:,\d{3})*|\d+).*?円'
+                    re.compile(r'(\w+).*?(\d{1,3}(?:,\d{3})*|\d+).*?円'),
+                    re.compile(r'合計.*?(\d{1,3}(?:,\d{3})*|\d+).*?円'),
+                    re.compile(r'補助.*?(\d{1,3}(?:,\d{3})*|\d+).*?円'),
+                    re.compile(r'自己資金.*?(\d{1,3}(?:,\d{3})*|\d+).*?円')
                 ]
             },
             'bonus_indicators': {
@@ -75,15 +257,91 @@ class SmallBusinessAnalyzer:
                     '赤字', '賃上げ', '賃金引上げ', '物価高騰', 'コロナ', '震災',
                     '地域資源', '地方創生', '経営力向上', '事業承継', '後継者',
                     'くるみん', 'えるぼし', '過疎地域'
+                ],
+                'priority_keywords': frozenset({'赤字', '賃上げ', '物価高騰', 'コロナ', '震災'}),
+                'policy_keywords': frozenset({'地域資源', '地方創生', '経営力向上', '事業承継'})
+            },
+            'completeness': {
+                'required_sections': [
+                    frozenset({'企業概要', '事業内容', '会社'}),
+                    frozenset({'売上', '財務', '業績'}),
+                    frozenset({'強み', '弱み', '特徴'}),
+                    frozenset({'市場', '競合', '顧客'}),
+                    frozenset({'目標', '計画', '方針'}),
+                    frozenset({'補助事業', '販路', '開拓'})
                 ]
             }
         }
     
+    def _build_keyword_matchers(self) -> Tuple[ahocorasick.Automaton, re.Pattern, Dict[str, tuple]]:
+        """全キーワードを1回の走査で検出するためのオートマトン構築（英字キーワードは大文字小文字を区別しない正規表現）"""
+        # 完成度判定の必須セクションは、キーワードごとに該当セクションのビットを持たせる
+        section_bits = {}
+        required_sections = self.analysis_patterns['completeness']['required_sections']
+        for index, section in enumerate(required_sections):
+            for keyword in section:
+                section_bits[keyword] = section_bits.get(keyword, 0) | (1 << index)
+        
+        keywords = set(section_bits)
+        for category in self.analysis_patterns.values():
+            for name, values in category.items():
+                if name.endswith('keywords'):
+                    keywords.update(values)
+        
+        # 日本語キーワードは小文字化の影響を受けないため、元のテキストをそのまま走査
+        automaton = ahocorasick.Automaton()
+        ascii_keywords = {}
+        for keyword in keywords:
+            if keyword.isascii():
+                ascii_keywords[keyword.lower()] = (keyword, section_bits.get(keyword, 0))
+            else:
+                automaton.add_word(keyword, (keyword, section_bits.get(keyword, 0)))
+        
+        automaton.make_automaton()
+        
+        # 英字キーワード（IT・SNS・DX等）は前後が英字でない箇所のみ検出（product・with等の英単語内は除外）
+        alternatives = '|'.join(re.escape(keyword) for keyword in sorted(ascii_keywords, key=len, reverse=True))
+        ascii_pattern = re.compile(f'(?<![A-Za-z])({alternatives})(?![A-Za-z])', re.IGNORECASE | re.ASCII)
+        
+        return automaton, ascii_pattern, ascii_keywords
+    
+    def _scan_keywords(self, text: str) -> Tuple[set, int]:
+        """テキスト中に出現するキーワードの集合と、記載のある必須セクションのビットマスクを取得"""
+        keyword_hits = set()
+        section_mask = 0
+        
+        for _, (keyword, bits) in self.keyword_automaton.iter(text):
+            keyword_hits.add(keyword)
+            section_mask |= bits
+        
+        for match in self.ascii_keyword_pattern.finditer(text):
+            keyword, bits = self.ascii_keywords[match.group(1).lower()]
+            keyword_hits.add(keyword)
+            section_mask |= bits
+        
+        return keyword_hits, section_mask
+    
     def analyze_pdf(self, uploaded_file) -> Dict[str, Any]:
-        """PDFファイルの解析"""
+        """PDFファイルの解析（ファイルオブジェクトのほか、bytes・memoryviewも受け付ける）"""
         try:
+            # ファイル内容は1回だけ読み込み、キャッシュキーとテキスト抽出で共用
+            if isinstance(uploaded_file, (bytes, bytearray, memoryview)):
+                data = uploaded_file  # コピーせずにそのまま利用
+            else:
+                uploaded_file.seek(0)
+                data = uploaded_file.read()
+            
+            # 同一内容のファイルは前回の解析結果を再利用
+            cache_key = hashlib.blake2b(data, digest_size=16).digest()
+            
+            with self._cache_lock:
+                if cache_key in self._cache:
+                    self._cache.move_to_end(cache_key)
+                    # キャッシュは全セッションで共有されるため、呼び出し側には複製を返す
+                    return copy.deepcopy(self._cache[cache_key])
+            
             # PDFからテキストを抽出
-            text_content = self._extract_text_from_pdf(uploaded_file)
+            text_content = self._extract_text_from_pdf(data)
             
             if not text_content:
                 return {
@@ -92,24 +350,38 @@ class SmallBusinessAnalyzer:
                     'text_content': ''
                 }
             
+            # キーワード検出（全カテゴリ共通で1回のみ走査）
+            keyword_hits, section_mask = self._scan_keywords(text_content)
+            
+            # 売上・利益・成長率の抽出（企業情報・財務データで共用）
+            financial_matches = self._scan_financial_patterns(text_content)
+            
+            # 円建て金額の抽出（経費明細・品質評価で共用）
+            amount_tokens = self._scan_amount_tokens(text_content)
+            
             # 各項目の解析
             analysis_result = {
                 'success': True,
                 'text_content': text_content,
                 'extracted_length': len(text_content),
-                'company_info': self._extract_company_info(text_content),
-                'financial_data': self._extract_financial_data(text_content),
-                'market_analysis': self._analyze_market_content(text_content),
-                'strengths_weaknesses': self._analyze_strengths_weaknesses(text_content),
-                'business_plan': self._analyze_business_plan(text_content),
-                'subsidy_plan': self._analyze_subsidy_plan(text_content),
-                'cost_breakdown': self._extract_cost_breakdown(text_content),
-                'bonus_indicators': self._detect_bonus_indicators(text_content),
-                'content_quality': self._assess_content_quality(text_content),
-                'completeness_score': self._calculate_completeness(text_content)
+                'company_info': self._extract_company_info(text_content, financial_matches, keyword_hits),
+                'financial_data': self._extract_financial_data(text_content, financial_matches),
+                'market_analysis': self._analyze_market_content(text_content, keyword_hits),
+                'strengths_weaknesses': self._analyze_strengths_weaknesses(text_content, keyword_hits),
+                'business_plan': self._analyze_business_plan(text_content, keyword_hits),
+                'subsidy_plan': self._analyze_subsidy_plan(text_content, keyword_hits),
+                'cost_breakdown': self._extract_cost_breakdown(text_content, amount_tokens),
+                'bonus_indicators': self._detect_bonus_indicators(text_content, keyword_hits),
+                'content_quality': self._assess_content_quality(text_content, amount_tokens),
+                'completeness_score': self._calculate_completeness(section_mask)
             }
             
-            return analysis_result
+            with self._cache_lock:
+                self._cache[cache_key] = analysis_result
+                if len(self._cache) > _ANALYSIS_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+            
+            return copy.deepcopy(analysis_result)
             
         except Exception as e:
             return {
@@ -118,20 +390,36 @@ class SmallBusinessAnalyzer:
                 'text_content': ''
             }
     
-    def _extract_text_from_pdf(self, uploaded_file) -> str:
+    def _extract_text_from_pdf(self, data: Union[bytes, memoryview]) -> str:
         """PDFからテキストを抽出"""
         try:
-            # ファイルポインタを先頭に戻す
-            uploaded_file.seek(0)
+            text_content = None
             
-            # PDFファイルを読み込み
-            pdf_reader = PyPDF2.PdfReader(uploaded_file)
-            text_content = ""
+            with _PYMUPDF_LOCK:
+                try:
+                    # PyMuPDF（C実装）で読み込み
+                    doc = pymupdf.open(stream=data, filetype="pdf")
+                except Exception:
+                    doc = None
+                
+                if doc is not None:
+                    # 全ページからテキストを抽出
+                    try:
+                        text_content = "\n".join(page.get_text("text") for page in doc)
+                    finally:
+                        doc.close()
             
-            # 全ページからテキストを抽出
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                text_content += page.extract_text() + "\n"
+            if text_content is None:
+                # PyMuPDFで開けない場合はPyPDF2で読み込み（厳密な構造検証は行わない）
+                pdf_reader = PyPDF2.PdfReader(io.BytesIO(data), strict=False)
+                page_texts = []
+                
+                for page in pdf_reader.pages:
+                    page_text = page.extract_text()
+                    if page_text:  # 空ページは除外
+                        page_texts.append(page_text)
+                
+                text_content = "\n".join(page_texts)
             
             # テキストのクリーニング
             text_content = self._clean_text(text_content)
@@ -143,372 +431,276 @@ class SmallBusinessAnalyzer:
     
     def _clean_text(self, text: str) -> str:
         """抽出したテキストのクリーニング"""
-        # 改行の正規化
-        text = re.sub(r'\n+', '\n', text)
-        
-        # 不要な空白の除去
-        text = re.sub(r' +', ' ', text)
-        
         # 制御文字の除去
-        text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', text)
+        text = text.translate(_CTRL_TABLE)
+        
+        # 改行の正規化と不要な空白の除去（連続する改行・空白を1文字に）
+        text = _WS_RE.sub(r'\1\2', text)
         
         return text.strip()
     
-    def _extract_company_info(self, text: str) -> Dict[str, Any]:
+    def _scan_financial_patterns(self, text: str) -> Dict[str, List[tuple]]:
+        """売上・利益・成長率パターンを1回の走査で抽出"""
+        matches = {kind: [] for kind in _FINANCIAL_FIELDS}
+        last_end = dict.fromkeys(_FINANCIAL_FIELDS, 0)
+        
+        for match in _FINANCIAL_RE.finditer(text):
+            start = match.start()
+            for kind, fields in _FINANCIAL_FIELDS.items():
+                # パターン単独のfindallと同じく、直前の一致と重なるものは除外
+                if start >= last_end[kind] and match.group(kind) is not None:
+                    matches[kind].append(match.group(*fields))
+                    last_end[kind] = match.end(kind)
+        
+        return matches
+    
+    def _scan_amount_tokens(self, text: str) -> List[tuple]:
+        """円建て金額を1回の走査で抽出（開始位置, 終了位置, 金額, 空白, 単位）"""
+        return [
+            (match.start(), match.end(), match.group(1), match.group(2), match.group(3))
+            for match in _AMOUNT_UNIT_RE.finditer(text)
+        ]
+    
+    def _extract_company_info(self, text: str, financial_matches: Dict[str, List[tuple]], keyword_hits: set) -> CompanyInfo:
         """企業情報の抽出"""
-        company_info = {
-            'company_name': None,
-            'representative': None,
-            'employees': None,
-            'capital': None,
-            'established': None,
-            'sales': []
-        }
+        company_info = CompanyInfo()
+        patterns = self.analysis_patterns['company_info']
         
+        # 各パターンは必須の語句がキーワード検出で見つかった場合のみ実行
         # 会社名
-        company_pattern = r'(株式会社|有限会社|合同会社|個人事業主)\s*([^\s\n]+)'
-        company_match = re.search(company_pattern, text)
-        if company_match:
-            company_info['company_name'] = company_match.group(1) + company_match.group(2)
+        if not keyword_hits.isdisjoint(patterns['company_type_keywords']):
+            company_match = _COMPANY_RE.search(text)
+            if company_match:
+                company_info.company_name = company_match.group(1) + company_match.group(2)
         
         # 代表者
-        rep_pattern = r'代表者.*?([^\s\n]+)'
-        rep_match = re.search(rep_pattern, text)
-        if rep_match:
-            company_info['representative'] = rep_match.group(1)
+        if '代表者' in keyword_hits:
+            rep_match = _REP_RE.search(text)
+            if rep_match:
+                company_info.representative = rep_match.group(1)
         
         # 従業員数
-        emp_pattern = r'従業員.*?(\d+).*?人'
-        emp_match = re.search(emp_pattern, text)
-        if emp_match:
-            company_info['employees'] = int(emp_match.group(1))
+        if '従業員' in keyword_hits:
+            emp_match = _EMP_RE.search(text)
+            if emp_match:
+                company_info.employees = int(emp_match.group(1))
         
         # 資本金
-        capital_pattern = r'資本金.*?(\d+).*?万円'
-        capital_match = re.search(capital_pattern, text)
-        if capital_match:
-            company_info['capital'] = int(capital_match.group(1))
+        if '資本金' in keyword_hits:
+            capital_match = _CAPITAL_RE.search(text)
+            if capital_match:
+                company_info.capital = int(capital_match.group(1))
         
         # 設立年
-        est_pattern = r'設立.*?(\d{4})年'
-        est_match = re.search(est_pattern, text)
-        if est_match:
-            company_info['established'] = int(est_match.group(1))
+        if '設立' in keyword_hits:
+            est_match = _EST_RE.search(text)
+            if est_match:
+                company_info.established = int(est_match.group(1))
         
         # 売上情報
-        sales_patterns = [
-            r'(\d{4})年.*?売上.*?(\d{1,3}(?:,\d{3})*|\d+).*?(万円|千円|億円)',
-            r'売上.*?(\d{1,3}(?:,\d{3})*|\d+).*?(万円|千円|億円)'
-        ]
-        
-        for pattern in sales_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
+        for kind in ('year_sales', 'sales'):
+            for match in financial_matches[kind]:
                 if len(match) == 3:  # 年度付き
-                    company_info['sales'].append({
-                        'year': int(match[0]),
-                        'amount': match[1].replace(',', ''),
-                        'unit': match[2]
-                    })
+                    company_info.sales.append(SalesEntry(int(match[0]), match[1].replace(',', ''), match[2]))
                 else:  # 年度なし
-                    company_info['sales'].append({
-                        'amount': match[0].replace(',', ''),
-                        'unit': match[1]
-                    })
+                    company_info.sales.append(SalesEntry(None, match[0].replace(',', ''), match[1]))
         
         return company_info
     
-    def _extract_financial_data(self, text: str) -> Dict[str, Any]:
+    def _extract_financial_data(self, text: str, financial_matches: Dict[str, List[tuple]]) -> FinancialData:
         """財務データの抽出"""
-        financial_data = {
-            'sales_history': [],
-            'profit_data': [],
-            'growth_rates': [],
-            'financial_indicators': []
-        }
-        
-        # 売上履歴
-        sales_pattern = r'(\d{4})年.*?(\d{1,3}(?:,\d{3})*|\d+).*?(万円|千円|億円)'
-        sales_matches = re.findall(sales_pattern, text)
-        for match in sales_matches:
-            financial_data['sales_history'].append({
-                'year': int(match[0]),
-                'amount': match[1].replace(',', ''),
-                'unit': match[2]
-            })
-        
-        # 利益データ
-        profit_pattern = r'利益.*?(\d{1,3}(?:,\d{3})*|\d+).*?(万円|千円|億円)'
-        profit_matches = re.findall(profit_pattern, text)
-        for match in profit_matches:
-            financial_data['profit_data'].append({
-                'amount': match[0].replace(',', ''),
-                'unit': match[1]
-            })
-        
-        # 成長率
-        growth_pattern = r'(前年比|増加|減少|成長).*?(\d+).*?%'
-        growth_matches = re.findall(growth_pattern, text)
-        for match in growth_matches:
-            financial_data['growth_rates'].append({
-                'type': match[0],
-                'rate': float(match[1])
-            })
-        
-        return financial_data
+        return FinancialData(
+            # 売上履歴
+            sales_history=[
+                SalesEntry(int(year), amount.replace(',', ''), unit)
+                for year, amount, unit in financial_matches['year_amount']
+            ],
+            # 利益データ
+            profit_data=[
+                ProfitEntry(amount.replace(',', ''), unit)
+                for amount, unit in financial_matches['profit']
+            ],
+            # 成長率
+            growth_rates=[
+                GrowthRate(growth_type, float(rate))
+                for growth_type, rate in financial_matches['growth']
+            ]
+        )
     
-    def _analyze_market_content(self, text: str) -> Dict[str, Any]:
+    def _analyze_market_content(self, text: str, keyword_hits: set) -> MarketAnalysis:
         """市場分析内容の解析"""
-        market_keywords = self.analysis_patterns['market_analysis']['keywords']
-        
-        market_content = {
-            'keyword_matches': [],
-            'market_size_mentions': [],
-            'competitor_analysis': False,
-            'customer_needs': False,
-            'market_trends': False
-        }
+        patterns = self.analysis_patterns['market_analysis']
         
-        text_lower = text.lower()
+        market_content = MarketAnalysis()
         
         # キーワードマッチング
-        for keyword in market_keywords:
-            if keyword in text_lower:
-                market_content['keyword_matches'].append(keyword)
+        for keyword in patterns['keywords']:
+            if keyword in keyword_hits:
+                market_content.keyword_matches.append(keyword)
         
         # 市場規模言及
-        market_size_pattern = r'市場.*?(\d+).*?(億円|万円|兆円)'
-        market_size_matches = re.findall(market_size_pattern, text)
-        market_content['market_size_mentions'] = market_size_matches
+        if '市場' in keyword_hits:
+            market_content.market_size_mentions = _MARKET_SIZE_RE.findall(text)
         
         # 競合分析の有無
-        competitor_keywords = ['競合', 'ライバル', '他社', '同業']
-        market_content['competitor_analysis'] = any(kw in text_lower for kw in competitor_keywords)
+        market_content.competitor_analysis = not keyword_hits.isdisjoint(patterns['competitor_keywords'])
         
         # 顧客ニーズ分析の有無
-        customer_keywords = ['顧客ニーズ', 'お客様', '利用者', 'ユーザー']
-        market_content['customer_needs'] = any(kw in text_lower for kw in customer_keywords)
+        market_content.customer_needs = not keyword_hits.isdisjoint(patterns['customer_keywords'])
         
         # 市場トレンド分析の有無
-        trend_keywords = ['トレンド', '動向', '変化', '成長', '拡大']
-        market_content['market_trends'] = any(kw in text_lower for kw in trend_keywords)
+        market_content.market_trends = not keyword_hits.isdisjoint(patterns['trend_keywords'])
         
         return market_content
     
-    def _analyze_strengths_weaknesses(self, text: str) -> Dict[str, Any]:
+    def _analyze_strengths_weaknesses(self, text: str, keyword_hits: set) -> StrengthsWeaknesses:
         """強み・弱み分析"""
-        strengths_weaknesses = {
-            'strengths_mentioned': [],
-            'weaknesses_mentioned': [],
-            'differentiation': False,
-            'competitive_advantage': False
-        }
+        strengths_weaknesses = StrengthsWeaknesses()
         
-        text_lower = text.lower()
+        patterns = self.analysis_patterns['strengths_weaknesses']
         
         # 強みの検出
-        strength_keywords = ['強み', '優位性', '特徴', '差別化', '独自', '他社にない']
-        for keyword in strength_keywords:
-            if keyword in text_lower:
-                strengths_weaknesses['strengths_mentioned'].append(keyword)
+        for keyword in patterns['strength_keywords']:
+            if keyword in keyword_hits:
+                strengths_weaknesses.strengths_mentioned.append(keyword)
         
         # 弱みの検出
-        weakness_keywords = ['弱み', '課題', '問題', '改善', '不足']
-        for keyword in weakness_keywords:
-            if keyword in text_lower:
-                strengths_weaknesses['weaknesses_mentioned'].append(keyword)
+        for keyword in patterns['weakness_keywords']:
+            if keyword in keyword_hits:
+                strengths_weaknesses.weaknesses_mentioned.append(keyword)
         
         # 差別化要素
-        diff_keywords = ['差別化', '独自', '他社との違い', 'オリジナル']
-        strengths_weaknesses['differentiation'] = any(kw in text_lower for kw in diff_keywords)
+        strengths_weaknesses.differentiation = not keyword_hits.isdisjoint(patterns['diff_keywords'])
         
         # 競争優位性
-        advantage_keywords = ['優位性', 'アドバンテージ', '競争力', '強み']
-        strengths_weaknesses['competitive_advantage'] = any(kw in text_lower for kw in advantage_keywords)
+        strengths_weaknesses.competitive_advantage = not keyword_hits.isdisjoint(patterns['advantage_keywords'])
         
         return strengths_weaknesses
     
-    def _analyze_business_plan(self, text: str) -> Dict[str, Any]:
+    def _analyze_business_plan(self, text: str, keyword_hits: set) -> BusinessPlan:
         """事業計画の解析"""
-        business_plan = {
-            'goals_mentioned': [],
-            'numerical_targets': [],
-            'timeline': [],
-            'strategies': [],
-            'implementation_plan': False
-        }
+        business_plan = BusinessPlan()
         
-        text_lower = text.lower()
+        patterns = self.analysis_patterns['business_plan']
         
         # 目標の検出
-        goal_keywords = ['目標', '計画', '予定', '方針', '戦略']
-        for keyword in goal_keywords:
-            if keyword in text_lower:
-                business_plan['goals_mentioned'].append(keyword)
+        for keyword in patterns['goal_keywords']:
+            if keyword in keyword_hits:
+                business_plan.goals_mentioned.append(keyword)
         
         # 数値目標
-        numerical_pattern = r'(売上|顧客|集客|利益).*?(\d+).*?(万円|千円|億円|人|件)'
-        numerical_matches = re.findall(numerical_pattern, text)
-        business_plan['numerical_targets'] = numerical_matches
+        if not keyword_hits.isdisjoint(patterns['target_keywords']):
+            business_plan.numerical_targets = _NUMERICAL_TGT_RE.findall(text)
         
         # タイムライン
-        timeline_pattern = r'(\d{4})年|(\d+)月|(\d+)年後'
-        timeline_matches = re.findall(timeline_pattern, text)
-        business_plan['timeline'] = [match for match in timeline_matches if any(match)]
+        business_plan.timeline = list(dict.fromkeys(_TIMELINE_RE.findall(text)))
         
         # 実施計画の詳細度
-        implementation_keywords = ['実施', '開始', '完了', '段階', 'ステップ', 'スケジュール']
-        business_plan['implementation_plan'] = any(kw in text_lower for kw in implementation_keywords)
+        business_plan.implementation_plan = not keyword_hits.isdisjoint(patterns['implementation_keywords'])
         
         return business_plan
     
-    def _analyze_subsidy_plan(self, text: str) -> Dict[str, Any]:
+    def _analyze_subsidy_plan(self, text: str, keyword_hits: set) -> SubsidyPlan:
         """補助事業計画の解析"""
-        subsidy_plan = {
-            'subsidy_items': [],
-            'sales_development': False,
-            'efficiency_improvement': False,
-            'digital_utilization': False,
-            'expected_effects': []
-        }
+        subsidy_plan = SubsidyPlan()
         
-        text_lower = text.lower()
+        patterns = self.analysis_patterns['subsidy_plan']
         
         # 補助事業項目
-        subsidy_keywords = self.analysis_patterns['subsidy_plan']['keywords']
-        for keyword in subsidy_keywords:
-            if keyword in text_lower:
-                subsidy_plan['subsidy_items'].append(keyword)
+        for keyword in patterns['keywords']:
+            if keyword in keyword_hits:
+                subsidy_plan.subsidy_items.append(keyword)
         
         # 販路開拓
-        sales_keywords = ['販路', '新規', '開拓', '顧客獲得', '営業']
-        subsidy_plan['sales_development'] = any(kw in text_lower for kw in sales_keywords)
+        subsidy_plan.sales_development = not keyword_hits.isdisjoint(patterns['sales_keywords'])
         
         # 業務効率化
-        efficiency_keywords = ['効率', '省力', '自動', '時短', '合理化']
-        subsidy_plan['efficiency_improvement'] = any(kw in text_lower for kw in efficiency_keywords)
+        subsidy_plan.efficiency_improvement = not keyword_hits.isdisjoint(patterns['efficiency_keywords'])
         
         # デジタル活用
-        digital_keywords = ['デジタル', 'it', 'ホームページ', 'sns', 'システム', 'dx']
-        subsidy_plan['digital_utilization'] = any(kw in text_lower for kw in digital_keywords)
+        subsidy_plan.digital_utilization = not keyword_hits.isdisjoint(patterns['digital_keywords'])
         
         # 期待効果
-        effect_pattern = r'効果.*?(\d+).*?(万円|人|件|%)'
-        effect_matches = re.findall(effect_pattern, text)
-        subsidy_plan['expected_effects'] = effect_matches
+        if '効果' in keyword_hits:
+            subsidy_plan.expected_effects = _EFFECT_RE.findall(text)
         
         return subsidy_plan
     
-    def _extract_cost_breakdown(self, text: str) -> Dict[str, Any]:
+    def _extract_cost_breakdown(self, text: str, amount_tokens: List[tuple]) -> CostBreakdown:
         """経費明細の抽出"""
-        cost_breakdown = {
-            'total_cost': None,
-            'subsidy_amount': None,
-            'self_funding': None,
-            'cost_items': []
-        }
+        cost_breakdown = CostBreakdown()
         
-        # 合計金額
-        total_pattern = r'合計.*?(\d{1,3}(?:,\d{3})*|\d+).*?円'
-        total_match = re.search(total_pattern, text)
-        if total_match:
-            cost_breakdown['total_cost'] = total_match.group(1).replace(',', '')
-        
-        # 補助金額
-        subsidy_pattern = r'補助.*?(\d{1,3}(?:,\d{3})*|\d+).*?円'
-        subsidy_match = re.search(subsidy_pattern, text)
-        if subsidy_match:
-            cost_breakdown['subsidy_amount'] = subsidy_match.group(1).replace(',', '')
-        
-        # 自己資金
-        self_fund_pattern = r'自己.*?(\d{1,3}(?:,\d{3})*|\d+).*?円'
-        self_fund_match = re.search(self_fund_pattern, text)
-        if self_fund_match:
-            cost_breakdown['self_funding'] = self_fund_match.group(1).replace(',', '')
-        
-        # 個別経費項目
-        cost_item_pattern = r'([^\d\n]+?)(\d{1,3}(?:,\d{3})*|\d+).*?円'
-        cost_items = re.findall(cost_item_pattern, text)
-        cost_breakdown['cost_items'] = [
-            {'item': item[0].strip(), 'amount': item[1].replace(',', '')}
-            for item in cost_items
-        ]
+        # 個別経費項目（合計・補助金額・自己資金も同じ走査で判定）
+        last_end = 0
+        for start, end, amount, _, unit in amount_tokens:
+            if unit != '円':
+                continue
+            
+            # 項目名は直前の経費項目以降、金額直前の40文字以内から取得
+            label_match = _COST_LABEL_RE.search(text, max(last_end, start - 40), start)
+            if not label_match:
+                continue  # 項目名のない金額（行頭の金額など）は経費項目として扱わない
+            item = label_match.group().strip()
+            last_end = end
+            amount = amount.replace(',', '')
+            
+            if cost_breakdown.total_cost is None and '合計' in item:
+                cost_breakdown.total_cost = amount
+            if cost_breakdown.subsidy_amount is None and '補助' in item:
+                cost_breakdown.subsidy_amount = amount
+            if cost_breakdown.self_funding is None and '自己' in item:
+                cost_breakdown.self_funding = amount
+            
+            cost_breakdown.cost_items.append(CostItem(item, amount))
         
         return cost_breakdown
     
-    def _detect_bonus_indicators(self, text: str) -> Dict[str, Any]:
+    def _detect_bonus_indicators(self, text: str, keyword_hits: set) -> BonusIndicators:
         """加点指標の検出"""
-        bonus_indicators = {
-            'detected_bonuses': [],
-            'priority_bonus': False,
-            'policy_bonus': False
-        }
+        bonus_indicators = BonusIndicators()
         
-        text_lower = text.lower()
-        bonus_keywords = self.analysis_patterns['bonus_indicators']['keywords']
+        patterns = self.analysis_patterns['bonus_indicators']
         
-        for keyword in bonus_keywords:
-            if keyword in text_lower:
-                bonus_indicators['detected_bonuses'].append(keyword)
+        for keyword in patterns['keywords']:
+            if keyword in keyword_hits:
+                bonus_indicators.detected_bonuses.append(keyword)
         
         # 重点政策加点
-        priority_keywords = ['赤字', '賃上げ', '物価高騰', 'コロナ', '震災']
-        bonus_indicators['priority_bonus'] = any(kw in text_lower for kw in priority_keywords)
+        bonus_indicators.priority_bonus = not keyword_hits.isdisjoint(patterns['priority_keywords'])
         
         # 政策加点
-        policy_keywords = ['地域資源', '地方創生', '経営力向上', '事業承継']
-        bonus_indicators['policy_bonus'] = any(kw in text_lower for kw in policy_keywords)
+        bonus_indicators.policy_bonus = not keyword_hits.isdisjoint(patterns['policy_keywords'])
         
         return bonus_indicators
     
-    def _assess_content_quality(self, text: str) -> Dict[str, Any]:
+    def _assess_content_quality(self, text: str, amount_tokens: List[tuple]) -> ContentQuality:
         """コンテンツ品質の評価"""
-        quality_assessment = {
-            'text_length': len(text),
-            'paragraph_count': len(text.split('\n\n')),
-            'numerical_data_count': len(re.findall(r'\d+', text)),
-            'concrete_expressions': 0,
-            'quality_score': 0.0
-        }
+        quality_assessment = ContentQuality(
+            text_length=len(text),
+            paragraph_count=text.count('\n\n') + 1,
+            numerical_data_count=sum(1 for _ in _DIGITS_RE.finditer(text))
+        )
         
         # 具体的表現のカウント
-        concrete_patterns = [
-            r'具体的に',
-            r'詳細',
-            r'\d+年\d+月',
-            r'\d+[万億千]円',
-            r'\d+人'
-        ]
-        
-        for pattern in concrete_patterns:
-            quality_assessment['concrete_expressions'] += len(re.findall(pattern, text))
+        quality_assessment.concrete_expressions = (
+            text.count('具体的に') + text.count('詳細') +
+            sum(1 for _ in _YM_RE.finditer(text)) +
+            sum(1 for _, _, _, spacing, unit in amount_tokens if unit != '円' and not spacing) +
+            sum(1 for _ in _NIN_RE.finditer(text))
+        )
         
         # 品質スコア計算
         length_score = min(1.0, len(text) / 2000)  # 2000文字を満点とする
-        numerical_score = min(1.0, quality_assessment['numerical_data_count'] / 20)  # 20個の数値データを満点とする
-        concrete_score = min(1.0, quality_assessment['concrete_expressions'] / 10)  # 10個の具体的表現を満点とする
+        numerical_score = min(1.0, quality_assessment.numerical_data_count / 20)  # 20個の数値データを満点とする
+        concrete_score = min(1.0, quality_assessment.concrete_expressions / 10)  # 10個の具体的表現を満点とする
         
-        quality_assessment['quality_score'] = (length_score + numerical_score + concrete_score) / 3
+        quality_assessment.quality_score = (length_score + numerical_score + concrete_score) / 3
         
         return quality_assessment
     
-    def _calculate_completeness(self, text: str) -> float:
+    def _calculate_completeness(self, section_mask: int) -> float:
         """記載内容の完成度計算"""
-        required_sections = [
-            ['企業概要', '事業内容', '会社'],
-            ['売上', '財務', '業績'],
-            ['強み', '弱み', '特徴'],
-            ['市場', '競合', '顧客'],
-            ['目標', '計画', '方針'],
-            ['補助事業', '販路', '開拓']
-        ]
-        
-        text_lower = text.lower()
-        completed_sections = 0
-        
-        for section in required_sections:
-            if any(keyword in text_lower for keyword in section):
-                completed_sections += 1
+        required_sections = self.analysis_patterns['completeness']['required_sections']
         
-        completeness_score = completed_sections / len(required_sections)
+        completeness_score = section_mask.bit_count() / len(required_sections)
         return round(completeness_score, 2)
\ No newline at end of file
@@ -1,16 +1,256 @@
 import streamlit as st
-import pandas as pd
 from small_business_scoring_engine import SmallBusinessScoringEngine
 from small_business_analyzer import SmallBusinessAnalyzer
-import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime
-import json
+import orjson
+import io
+import csv
+
+# カスタムCSS
+_CUSTOM_CSS = """
+<style>
+.main-header {
+    background: linear-gradient(90deg, #4CAF50, #45a049);
+    padding: 2rem;
+    border-radius: 10px;
+    color: white;
+    text-align: center;
+    margin-bottom: 2rem;
+}
+.score-card {
+    background: white;
+    padding: 1.5rem;
+    border-radius: 10px;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+    border-left: 4px solid #4CAF50;
+}
+.improvement-card {
+    background: #fff3cd;
+    padding: 1rem;
+    border-radius: 8px;
+    border-left: 4px solid #ffc107;
+    margin: 0.5rem 0;
+}
+.warning-card {
+    background: #f8d7da;
+    padding: 1rem;
+    border-radius: 8px;
+    border-left: 4px solid #dc3545;
+    margin: 0.5rem 0;
+}
+.success-card {
+    background: #d4edda;
+    padding: 1rem;
+    border-radius: 8px;
+    border-left: 4px solid #28a745;
+    margin: 0.5rem 0;
+}
+</style>
+"""
+
+# ヘッダー
+_HEADER_HTML = """
+<div class="main-header">
+    <h1>📊 小規模事業者持続化補助金 模擬採点システム</h1>
+    <p>公募要領の審査基準に基づく正確な採点と具体的な改善提案</p>
+</div>
+"""
+
+# デモ用のサンプル採点結果（表示のみで変更しない）
+_SAMPLE_RESULTS = {
+    'total_score': 68.5,
+    'evaluation_level': '良好',
+    'adoption_probability': 72.3,
+    'basic_requirements_passed': True,
+    'bonus_points': 5.0,
+    'detailed_scores': {
+        '経営状況分析の妥当性': {'score': 18.5, 'max_score': 25},
+        '経営方針・目標の適切性': {'score': 20.0, 'max_score': 25},
+        '補助事業計画の有効性': {'score': 22.0, 'max_score': 30},
+        '積算の透明・適切性': {'score': 8.0, 'max_score': 20}
+    },
+    'improvements': [
+        {
+            'item': '市場分析の深化',
+            'priority': '重要',
+            'current_issue': '競合分析が表面的で、市場規模や成長性の具体的データが不足',
+            'improvement_method': '統計データや業界レポートを活用した定量的な市場分析を追加',
+            'example': '「○○業界の市場規模は○○億円で、年成長率○%。主要競合3社の売上・シェア分析...」'
+        }
+    ]
+}
+
+@st.cache_resource
+def _get_engine() -> SmallBusinessScoringEngine:
+    """採点エンジンはプロセス内で1つだけ生成"""
+    return SmallBusinessScoringEngine()
+
+@st.cache_resource
+def _get_analyzer() -> SmallBusinessAnalyzer:
+    """解析器はプロセス内で1つだけ生成（解析結果もファイル内容ごとに保持される）"""
+    return SmallBusinessAnalyzer()
+
+# グラフ定義（同じ値の図はキャッシュから返し、plotlyの図の組み立てを省く）
+@st.cache_data(show_spinner=False, max_entries=8)
+def _gauge_figure(total_score: float, basic_passed: bool) -> dict:
+    """スコアゲージの図定義（基礎審査未通過の場合は基準点との差を表示しない）"""
+    import plotly.graph_objects as go  # 起動時間短縮のため使用時に読み込む
+    
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta" if basic_passed else "gauge+number",
+        value=total_score,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "総合スコア"},
+        delta={'reference': 65} if basic_passed else None,
+        gauge={
+            'axis': {'range': [None, 100]},
+            'bar': {'color': "darkblue"},
+            'steps': [
+                {'range': [0, 35], 'color': "lightgray"},
+                {'range': [35, 50], 'color': "yellow"},
+                {'range': [50, 65], 'color': "orange"},
+                {'range': [65, 80], 'color': "lightgreen"},
+                {'range': [80, 100], 'color': "green"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 65
+            }
+        }
+    ))
+    fig.update_layout(height=260, template="none", margin=dict(l=10, r=10, t=30, b=10))
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _radar_figure(categories: tuple, scores: tuple, max_scores: tuple) -> dict:
+    """評価項目別レーダーチャートの図定義（WebGL描画・既定テーマなし）"""
+    import plotly.graph_objects as go  # 起動時間短縮のため使用時に読み込む
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatterpolargl(
+        r=scores,
+        theta=categories,
+        fill='toself',
+        fillcolor='rgba(76, 175, 80, 0.3)',
+        line=dict(color='rgb(76, 175, 80)'),
+        name='実際のスコア'
+    ))
+    fig.add_trace(go.Scatterpolargl(
+        r=max_scores,
+        theta=categories,
+        fill='toself',
+        fillcolor='rgba(200, 200, 200, 0.2)',
+        line=dict(color='rgb(200, 200, 200)'),
+        name='満点'
+    ))
+    
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 30]
+            )),
+        showlegend=True,
+        title="評価項目別スコア比較",
+        template="none",
+        paper_bgcolor='white',
+        margin=dict(l=20, r=20, t=40, b=20)
+    )
+    return fig.to_dict()
+
+# エクスポート用データ（同じ採点結果に対しては再生成しない）
+def _report_json(results) -> bytes:
+    """詳細レポート（JSON）の生成（採点日時が毎回変わるためキャッシュしない。orjsonはUTF-8のbytesを直接出力）"""
+    return orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+@st.cache_data(show_spinner=False)
+def _improvements_csv(improvements) -> str:
+    """改善提案（CSV）の生成"""
+    # 列は各提案の項目名を出現順にまとめたもの
+    fieldnames = list(dict.fromkeys(key for imp in improvements for key in imp))
+    
+    buffer = io.StringIO()
+    buffer.write('\ufeff')  # Excelで文字化けしないようBOMを付与
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, lineterminator='\n')
+    writer.writeheader()
+    writer.writerows(improvements)
+    return buffer.getvalue()
+
+@st.cache_data(show_spinner=False)
+def _scores_csv(detailed_scores) -> str:
+    """採点結果（CSV）の生成"""
+    buffer = io.StringIO()
+    buffer.write('\ufeff')  # Excelで文字化けしないようBOMを付与
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(['評価項目', '得点', '満点', '達成率'])
+    for criterion, score_info in detailed_scores.items():
+        writer.writerow([
+            criterion,
+            score_info['score'],
+            score_info['max_score'],
+            score_info['score']/score_info['max_score']*100
+        ])
+    return buffer.getvalue()
+
+# 改善提案カード（重要度別、format_mapで提案の各項目を埋め込む）
+_WARN_TMPL = (
+    '<div class="warning-card">'
+    '<h4>❌ {item}</h4>'
+    '<p><strong>現状の問題:</strong> {current_issue}</p>'
+    '<p><strong>改善方法:</strong> {improvement_method}</p>'
+    '<p><strong>具体例:</strong> {example}</p>'
+    '</div>'
+)
+_IMP_TMPL = (
+    '<div class="improvement-card">'
+    '<h4>🔧 {item}</h4>'
+    '<p><strong>現状の問題:</strong> {current_issue}</p>'
+    '<p><strong>改善方法:</strong> {improvement_method}</p>'
+    '<p><strong>具体例:</strong> {example}</p>'
+    '</div>'
+)
+_SUCC_TMPL = (
+    '<div class="success-card">'
+    '<h4>✨ {item}</h4>'
+    '<p><strong>改善効果:</strong> {current_issue}</p>'
+    '<p><strong>実施方法:</strong> {improvement_method}</p>'
+    '<p><strong>具体例:</strong> {example}</p>'
+    '</div>'
+)
+
+# 採点結果・審査状況カード
+_SCORE_CARD_TMPL = (
+    '<div class="score-card">'
+    '<h3>📊 採点結果</h3>'
+    '<h2 style="color: #4CAF50;">{total_score:.1f}点</h2>'
+    '<p><strong>評価レベル:</strong> {evaluation_level}</p>'
+    '<p><strong>採択可能性:</strong> {adoption_probability:.1f}%</p>'
+    '</div>'
+)
+_STATUS_CARD_TMPL = (
+    '<div class="score-card">'
+    '<h3>🎯 審査状況</h3>'
+    '<p><strong>基礎審査:</strong> {basic_status}</p>'
+    '<p><strong>計画審査:</strong> {total_score:.1f}/100点</p>'
+    '<p><strong>加点項目:</strong> {bonus_points:.1f}点</p>'
+    '</div>'
+)
+
+def _bonus_markdown(bonuses) -> str:
+    """加点項目の該当状況を1つのMarkdownにまとめて生成"""
+    lines = []
+    for bonus in bonuses:
+        status = "✅ 該当" if bonus['eligible'] else "❌ 非該当"
+        lines.append(f"**{bonus['name']}**: {status}")
+        if not bonus['eligible'] and bonus.get('requirements'):
+            lines.append(f"要件: {bonus['requirements']}")
+    return "\n\n".join(lines)
 
 class SmallBusinessScoringApp:
     def __init__(self):
-        self.scoring_engine = SmallBusinessScoringEngine()
-        self.analyzer = SmallBusinessAnalyzer()
+        self.scoring_engine = _get_engine()
+        self.analyzer = _get_analyzer()
         
     def setup_page(self):
         st.set_page_config(
@@ -20,55 +260,11 @@ class SmallBusinessScoringApp:
             initial_sidebar_state="expanded"
         )
         
-        # カスタムCSS
-        st.markdown("""
-        <style>
-        .main-header {
-            background: linear-gradient(90deg, #4CAF50, #45a049);
-            padding: 2rem;
-            border-radius: 10px;
-            color: white;
-            text-align: center;
-            margin-bottom: 2rem;
-        }
-        .score-card {
-            background: white;
-            padding: 1.5rem;
-            border-radius: 10px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            border-left: 4px solid #4CAF50;
-        }
-        .improvement-card {
-            background: #fff3cd;
-            padding: 1rem;
-            border-radius: 8px;
-            border-left: 4px solid #ffc107;
-            margin: 0.5rem 0;
-        }
-        .warning-card {
-            background: #f8d7da;
-            padding: 1rem;
-            border-radius: 8px;
-            border-left: 4px solid #dc3545;
-            margin: 0.5rem 0;
-        }
-        .success-card {
-            background: #d4edda;
-            padding: 1rem;
-            border-radius: 8px;
-            border-left: 4px solid #28a745;
-            margin: 0.5rem 0;
-        }
-        </style>
-        """, unsafe_allow_html=True)
+        # カスタムCSS（再実行のたびに再送信が必要なため、毎回出力する）
+        st.markdown(_CUSTOM_CSS, unsafe_allow_html=True)
 
     def render_header(self):
-        st.markdown("""
-        <div class="main-header">
-            <h1>📊 小規模事業者持続化補助金 模擬採点システム</h1>
-            <p>公募要領の審査基準に基づく正確な採点と具体的な改善提案</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_HEADER_HTML, unsafe_allow_html=True)
 
     def render_sidebar(self):
         with st.sidebar:
@@ -102,171 +298,115 @@ class SmallBusinessScoringApp:
     def render_file_upload(self):
         st.markdown("## 📄 申請書類アップロード")
         
-        uploaded_file = st.file_uploader(
-            "経営計画書兼補助事業計画書（PDF）をアップロードしてください",
-            type=['pdf'],
-            help="様式2の経営計画書・補助事業計画書をPDF形式でアップロードしてください"
-        )
+        # 採点はボタン押下時のみ実行（ファイル選択だけでは再実行しない）
+        with st.form("scoring_form"):
+            uploaded_file = st.file_uploader(
+                "経営計画書兼補助事業計画書（PDF）をアップロードしてください",
+                type=['pdf'],
+                help="様式2の経営計画書・補助事業計画書をPDF形式でアップロードしてください"
+            )
+            submitted = st.form_submit_button("📊 採点を実行", use_container_width=True)
         
-        if uploaded_file is not None:
-            st.success(f"✅ ファイル '{uploaded_file.name}' がアップロードされました")
+        if uploaded_file is None:
+            # ファイルが取り除かれた場合は保持していた採点対象（ファイル内容）を解放
+            st.session_state.pop('scoring_target', None)
+            if submitted:
+                st.warning("⚠️ PDFファイルを選択してから採点を実行してください")
+        elif submitted:
+            # 採点対象を保持し、サイドバーの設定変更による再実行でも結果を表示し続ける
+            st.session_state['scoring_target'] = {
+                'name': uploaded_file.name,
+                'size': uploaded_file.size,
+                'data': uploaded_file.getbuffer()  # コピーせずにmemoryviewで保持
+            }
+        
+        scoring_target = st.session_state.get('scoring_target')
+        if scoring_target is not None:
+            st.success(f"✅ ファイル '{scoring_target['name']}' がアップロードされました")
             
             # ファイル情報表示
-            file_details = {"ファイル名": uploaded_file.name, "ファイルサイズ": f"{uploaded_file.size} bytes"}
-            st.json(file_details)
+            st.caption(f"📄 {scoring_target['name']} ({scoring_target['size']:,} bytes)")
             
-            return uploaded_file
+            return scoring_target
         
         return None
 
+    @st.fragment
     def render_scoring_results(self, results):
         # 総合スコア表示
         col1, col2, col3 = st.columns([2, 1, 1])
         
         with col1:
-            # スコアゲージ
-            fig = go.Figure(go.Indicator(
-                mode="gauge+number+delta",
-                value=results['total_score'],
-                domain={'x': [0, 1], 'y': [0, 1]},
-                title={'text': "総合スコア"},
-                delta={'reference': 65},
-                gauge={
-                    'axis': {'range': [None, 100]},
-                    'bar': {'color': "darkblue"},
-                    'steps': [
-                        {'range': [0, 35], 'color': "lightgray"},
-                        {'range': [35, 50], 'color': "yellow"},
-                        {'range': [50, 65], 'color': "orange"},
-                        {'range': [65, 80], 'color': "lightgreen"},
-                        {'range': [80, 100], 'color': "green"}
-                    ],
-                    'threshold': {
-                        'line': {'color': "red", 'width': 4},
-                        'thickness': 0.75,
-                        'value': 65
-                    }
-                }
-            ))
-            fig.update_layout(height=300)
-            st.plotly_chart(fig, use_container_width=True)
+            # スコアゲージ（同じ得点の図は再生成しない）
+            basic_passed = results['basic_requirements_passed']
+            fig = _gauge_figure(results['total_score'], basic_passed)
+            # 操作不要なゲージは静的描画にしてイベント処理を省く
+            st.plotly_chart(fig, use_container_width=True, config={'staticPlot': True, 'displayModeBar': False})
         
         with col2:
-            st.markdown(f"""
-            <div class="score-card">
-                <h3>📊 採点結果</h3>
-                <h2 style="color: #4CAF50;">{results['total_score']:.1f}点</h2>
-                <p><strong>評価レベル:</strong> {results['evaluation_level']}</p>
-                <p><strong>採択可能性:</strong> {results['adoption_probability']:.1f}%</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_SCORE_CARD_TMPL.format_map(results), unsafe_allow_html=True)
         
         with col3:
-            st.markdown(f"""
-            <div class="score-card">
-                <h3>🎯 審査状況</h3>
-                <p><strong>基礎審査:</strong> {'✅ 通過' if results['basic_requirements_passed'] else '❌ 要改善'}</p>
-                <p><strong>計画審査:</strong> {results['total_score']:.1f}/100点</p>
-                <p><strong>加点項目:</strong> {results['bonus_points']:.1f}点</p>
-            </div>
-            """, unsafe_allow_html=True)
+            basic_status = '✅ 通過' if basic_passed else '❌ 要改善'
+            st.markdown(_STATUS_CARD_TMPL.format(basic_status=basic_status, **results), unsafe_allow_html=True)
 
+    @st.fragment
     def render_detailed_scores(self, results):
         st.markdown("## 📋 項目別採点詳細")
         
-        # 4つの主要評価軸
-        criteria_data = []
+        # 表・レーダーチャート用の値を1回の走査でまとめて取得
+        categories, scores, max_scores, achievement_rates = [], [], [], []
         for criterion, score_info in results['detailed_scores'].items():
-            criteria_data.append({
-                '評価項目': criterion,
-                '得点': f"{score_info['score']:.1f}",
-                '満点': f"{score_info['max_score']:.1f}",
-                '達成率': f"{(score_info['score']/score_info['max_score']*100):.1f}%"
-            })
-        
-        df = pd.DataFrame(criteria_data)
-        st.dataframe(df, use_container_width=True)
+            categories.append(criterion)
+            scores.append(score_info['score'])
+            max_scores.append(score_info['max_score'])
+            achievement_rates.append(score_info['score']/score_info['max_score']*100)
         
-        # レーダーチャート
-        categories = list(results['detailed_scores'].keys())
-        scores = [results['detailed_scores'][cat]['score'] for cat in categories]
-        max_scores = [results['detailed_scores'][cat]['max_score'] for cat in categories]
+        # 4つの主要評価軸（列ごとの辞書をそのまま表示）
+        criteria_data = {
+            '評価項目': categories,
+            '得点': [f"{score:.1f}" for score in scores],
+            '満点': [f"{max_score:.1f}" for max_score in max_scores],
+            '達成率': [f"{rate:.1f}%" for rate in achievement_rates]
+        }
         
-        fig = go.Figure()
-        fig.add_trace(go.Scatterpolar(
-            r=scores,
-            theta=categories,
-            fill='toself',
-            fillcolor='rgba(76, 175, 80, 0.3)',
-            line=dict(color='rgb(76, 175, 80)'),
-            name='実際のスコア'
-        ))
-        fig.add_trace(go.Scatterpolar(
-            r=max_scores,
-            theta=categories,
-            fill='toself',
-            fillcolor='rgba(200, 200, 200, 0.2)',
-            line=dict(color='rgb(200, 200, 200)'),
-            name='満点'
-        ))
+        st.dataframe(criteria_data, use_container_width=True)
         
-        fig.update_layout(
-            polar=dict(
-                radialaxis=dict(
-                    visible=True,
-                    range=[0, 30]
-                )),
-            showlegend=True,
-            title="評価項目別スコア比較"
-        )
+        # レーダーチャート（同じ採点結果の図は再生成しない）
+        fig = _radar_figure(tuple(categories), tuple(scores), tuple(max_scores))
         st.plotly_chart(fig, use_container_width=True)
 
+    @st.fragment
     def render_improvements(self, results):
         st.markdown("## 🔧 改善提案")
         
         improvements = results['improvements']
         
-        # 重要度別に分類
-        critical_improvements = [imp for imp in improvements if imp['priority'] == '緊急']
-        important_improvements = [imp for imp in improvements if imp['priority'] == '重要']
-        recommended_improvements = [imp for imp in improvements if imp['priority'] == '推奨']
+        # 重要度別に分類（1回の走査で振り分け）
+        buckets = {'緊急': [], '重要': [], '推奨': []}
+        for imp in improvements:
+            bucket = buckets.get(imp['priority'])
+            if bucket is not None:
+                bucket.append(imp)
         
+        critical_improvements = buckets['緊急']
+        important_improvements = buckets['重要']
+        recommended_improvements = buckets['推奨']
+        
+        # 各区分のカードはまとめて1回で出力
         if critical_improvements:
             st.markdown("### 🚨 緊急改善項目")
-            for imp in critical_improvements:
-                st.markdown(f"""
-                <div class="warning-card">
-                    <h4>❌ {imp['item']}</h4>
-                    <p><strong>現状の問題:</strong> {imp['current_issue']}</p>
-                    <p><strong>改善方法:</strong> {imp['improvement_method']}</p>
-                    <p><strong>具体例:</strong> {imp['example']}</p>
-                </div>
-                """, unsafe_allow_html=True)
+            st.markdown("".join(map(_WARN_TMPL.format_map, critical_improvements)), unsafe_allow_html=True)
         
         if important_improvements:
             st.markdown("### ⚠️ 重要改善項目")
-            for imp in important_improvements:
-                st.markdown(f"""
-                <div class="improvement-card">
-                    <h4>🔧 {imp['item']}</h4>
-                    <p><strong>現状の問題:</strong> {imp['current_issue']}</p>
-                    <p><strong>改善方法:</strong> {imp['improvement_method']}</p>
-                    <p><strong>具体例:</strong> {imp['example']}</p>
-                </div>
-                """, unsafe_allow_html=True)
+            st.markdown("".join(map(_IMP_TMPL.format_map, important_improvements)), unsafe_allow_html=True)
         
         if recommended_improvements:
             st.markdown("### 💡 推奨改善項目")
-            for imp in recommended_improvements:
-                st.markdown(f"""
-                <div class="success-card">
-                    <h4>✨ {imp['item']}</h4>
-                    <p><strong>改善効果:</strong> {imp['current_issue']}</p>
-                    <p><strong>実施方法:</strong> {imp['improvement_method']}</p>
-                    <p><strong>具体例:</strong> {imp['example']}</p>
-                </div>
-                """, unsafe_allow_html=True)
+            st.markdown("".join(map(_SUCC_TMPL.format_map, recommended_improvements)), unsafe_allow_html=True)
 
+    @st.fragment
     def render_bonus_analysis(self, results):
         st.markdown("## ⭐ 加点項目分析")
         
@@ -278,11 +418,7 @@ class SmallBusinessScoringApp:
             st.markdown("### 🎯 重点政策加点")
             priority_bonuses = bonus_analysis.get('priority_bonuses', [])
             if priority_bonuses:
-                for bonus in priority_bonuses:
-                    status = "✅ 該当" if bonus['eligible'] else "❌ 非該当"
-                    st.markdown(f"**{bonus['name']}**: {status}")
-                    if not bonus['eligible'] and bonus.get('requirements'):
-                        st.markdown(f"要件: {bonus['requirements']}")
+                st.markdown(_bonus_markdown(priority_bonuses))
             else:
                 st.info("重点政策加点の分析結果がありません")
         
@@ -290,58 +426,45 @@ class SmallBusinessScoringApp:
             st.markdown("### 🏆 政策加点")
             policy_bonuses = bonus_analysis.get('policy_bonuses', [])
             if policy_bonuses:
-                for bonus in policy_bonuses:
-                    status = "✅ 該当" if bonus['eligible'] else "❌ 非該当"
-                    st.markdown(f"**{bonus['name']}**: {status}")
-                    if not bonus['eligible'] and bonus.get('requirements'):
-                        st.markdown(f"要件: {bonus['requirements']}")
+                st.markdown(_bonus_markdown(policy_bonuses))
             else:
                 st.info("政策加点の分析結果がありません")
 
+    @st.fragment
     def render_export_options(self, results):
         st.markdown("## 📤 結果エクスポート")
         
+        # 3つのファイル名で共通のタイムスタンプ
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            if st.button("📊 詳細レポート（JSON）", use_container_width=True):
-                json_data = json.dumps(results, ensure_ascii=False, indent=2)
-                st.download_button(
-                    "ダウンロード",
-                    data=json_data,
-                    file_name=f"scoring_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                    mime="application/json"
-                )
+            st.download_button(
+                "📊 詳細レポート（JSON）",
+                data=_report_json(results),
+                file_name=f"scoring_report_{timestamp}.json",
+                mime="application/json",
+                use_container_width=True
+            )
         
         with col2:
-            if st.button("📋 改善提案（CSV）", use_container_width=True):
-                improvements_df = pd.DataFrame(results['improvements'])
-                csv_data = improvements_df.to_csv(index=False, encoding='utf-8-sig')
-                st.download_button(
-                    "ダウンロード",
-                    data=csv_data,
-                    file_name=f"improvements_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
+            st.download_button(
+                "📋 改善提案（CSV）",
+                data=_improvements_csv(results['improvements']),
+                file_name=f"improvements_{timestamp}.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
         
         with col3:
-            if st.button("📈 採点結果（CSV）", use_container_width=True):
-                scores_data = []
-                for criterion, score_info in results['detailed_scores'].items():
-                    scores_data.append({
-                        '評価項目': criterion,
-                        '得点': score_info['score'],
-                        '満点': score_info['max_score'],
-                        '達成率': score_info['score']/score_info['max_score']*100
-                    })
-                scores_df = pd.DataFrame(scores_data)
-                csv_data = scores_df.to_csv(index=False, encoding='utf-8-sig')
-                st.download_button(
-                    "ダウンロード",
-                    data=csv_data,
-                    file_name=f"scores_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
+            st.download_button(
+                "📈 採点結果（CSV）",
+                data=_scores_csv(results['detailed_scores']),
+                file_name=f"scores_{timestamp}.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
 
     def run(self):
         self.setup_page()
@@ -349,23 +472,24 @@ class SmallBusinessScoringApp:
         self.render_sidebar()
         
         # メインコンテンツ
-        uploaded_file = self.render_file_upload()
+        scoring_target = self.render_file_upload()
         
-        if uploaded_file is not None:
+        if scoring_target is not None:
             with st.spinner("📄 PDF解析中..."):
                 try:
-                    # PDF解析
-                    document_analysis = self.analyzer.analyze_pdf(uploaded_file)
+                    # PDF解析（同一ファイルの再実行時は解析器のキャッシュを利用）
+                    document_analysis = self.analyzer.analyze_pdf(scoring_target['data'])
                     
                     if document_analysis and document_analysis.get('success'):
                         st.success("✅ PDF解析が完了しました")
                         
                         if self.show_details:
-                            with st.expander("📄 解析結果詳細"):
-                                st.json(document_analysis)
+                            with st.expander("📄 解析結果詳細", expanded=False):
+                                # JSONツリーより軽量なコードブロックで表示
+                                st.code(orjson.dumps(document_analysis, option=orjson.OPT_INDENT_2).decode(), language="json")
                         
                         with st.spinner("🔍 採点中..."):
-                            # 採点実行
+                            # 採点実行（設定の切り替えのみの再実行時は採点エンジンのキャッシュを利用）
                             scoring_results = self.scoring_engine.score_application(
                                 document_analysis,
                                 strict_mode=self.strict_mode
@@ -402,32 +526,9 @@ class SmallBusinessScoringApp:
         else:
             # サンプル結果表示（デモ用）
             st.markdown("## 📋 サンプル採点結果")
-            st.info("PDFファイルをアップロードすると、実際の採点結果がここに表示されます")
+            st.info("PDFファイルをアップロードして採点を実行すると、実際の採点結果がここに表示されます")
             
-            # デモ用のサンプルデータ
-            sample_results = {
-                'total_score': 68.5,
-                'evaluation_level': '良好',
-                'adoption_probability': 72.3,
-                'basic_requirements_passed': True,
-                'bonus_points': 5.0,
-                'detailed_scores': {
-                    '経営状況分析の妥当性': {'score': 18.5, 'max_score': 25},
-                    '経営方針・目標の適切性': {'score': 20.0, 'max_score': 25},
-                    '補助事業計画の有効性': {'score': 22.0, 'max_score': 30},
-                    '積算の透明・適切性': {'score': 8.0, 'max_score': 20}
-                },
-                'improvements': [
-                    {
-                        'item': '市場分析の深化',
-                        'priority': '重要',
-                        'current_issue': '競合分析が表面的で、市場規模や成長性の具体的データが不足',
-                        'improvement_method': '統計データや業界レポートを活用した定量的な市場分析を追加',
-                        'example': '「○○業界の市場規模は○○億円で、年成長率○%。主要競合3社の売上・シェア分析...」'
-                    }
-                ]
-            }
-            self.render_scoring_results(sample_results)
+            self.render_scoring_results(_SAMPLE_RESULTS)
 
 if __name__ == "__main__":
     app = SmallBusinessScoringApp()
@@ -1,130 +1,314 @@
+import ahocorasick
+import bisect
+import copy
+import hashlib
 import re
+import sys
+import threading
 import math
+import numpy as np
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Iterator
 
-class SmallBusinessScoringEngine:
-    """小規模事業者持続化補助金の採点エンジン"""
-    
-    def __init__(self):
-        self.scoring_criteria = self._initialize_scoring_criteria()
-        self.bonus_criteria = self._initialize_bonus_criteria()
-        
-    def _initialize_scoring_criteria(self) -> Dict[str, Any]:
-        """採点基準の初期化"""
-        return {
-            '経営状況分析の妥当性': {
-                'max_score': 25,
-                'weight': 0.25,
-                'sub_criteria': {
-                    '企業概要の充実度': {'weight': 0.3, 'keywords': ['事業内容', '創業', '沿革', '従業員', '売上', '顧客']},
-                    '売上・財務分析': {'weight': 0.3, 'keywords': ['売上高', '利益', '推移', '増減', '要因', '財務']},
-                    '強み・弱み分析': {'weight': 0.25, 'keywords': ['強み', '弱み', '特徴', '優位性', '課題', '問題']},
-                    '市場・競合認識': {'weight': 0.15, 'keywords': ['市場', '競合', '業界', '動向', 'ライバル', 'シェア']}
-                }
+_SCORE_CACHE_SIZE = 128
+
+# 基礎審査の必須項目（項目ごとにキーワードのいずれかを1回の走査で検索）
+_REQUIRED_PATTERNS = tuple(
+    (item_name, re.compile('|'.join(map(re.escape, keywords))))
+    for item_name, keywords in (
+        ('企業概要', ('事業内容', '業種', '従業員')),
+        ('売上情報', ('売上', '売上高', '利益')),
+        ('経営方針', ('方針', '目標', '計画')),
+        ('補助事業計画', ('補助事業', '計画', '内容'))
+    )
+)
+
+# 具体的な表現
+_CONCRETE_PATTERNS = tuple(map(sys.intern, ('具体的に', '詳細', '明確', '○○', 'について', 'により')))
+
+# 数値表現のパターン（具体性評価・文書品質・厳格モード・改善提案の判定を1回の走査で行う）
+# 各パターンは末尾の単位が異なるため一致範囲は重ならず、個別に検索した場合と同じ種類が検出される
+# （「年」だけのパターンは日付に一致しなかった場合のみ一致するが、日付も「年」を含むため数値データの判定は変わらない）
+_NUMERIC_SCAN = re.compile(
+    r'(?P<date>\d+年\d+月)'  # 具体的な日付
+    r'|(?P<money>\d+[万億千]円)'  # 具体的な金額
+    r'|(?P<people>\d+[万千]人)'  # 具体的な人数
+    r'|(?P<pct>\d+%)'  # 具体的な割合
+    r'|(?P<times>\d+回)'  # 具体的な回数
+    r'|(?P<yen>\d+[百十]?円)'  # その他の金額
+    r'|(?P<persons>\d+[百十]?人)'  # その他の人数
+    r'|(?P<year>\d+年)'  # 年
+)
+_NUMERIC_BITS = {name: 1 << index for index, name in enumerate(_NUMERIC_SCAN.groupindex)}
+
+# 判定ごとの対象ビット
+_SPEC_MASK = sum(_NUMERIC_BITS[name] for name in ('date', 'money', 'people', 'pct', 'times'))
+_MONEY_PEOPLE_MASK = _NUMERIC_BITS['money'] | _NUMERIC_BITS['people']
+_MONEY_MASK = _NUMERIC_BITS['money']
+_NUMERIC_Q_MASK = sum(_NUMERIC_BITS[name] for name in ('date', 'money', 'people', 'pct', 'yen', 'persons', 'year'))
+
+# 評価レベル・採択可能性（基本確率）の閾値（各閾値以上で次の区分）
+_EVAL_THRESH = (35, 50, 65, 80)
+_EVAL_LABELS = ('不適格', '不十分', '普通', '良好', '優秀')
+_PROB_THRESH = (50, 60, 70, 80)
+_PROB_BASE = (10, 30, 50, 70, 85)
+
+def _freeze(obj):
+    """入れ子の辞書・リストを読み取り専用のMappingProxyType・タプルに変換（文字列はインターン化）"""
+    if isinstance(obj, dict):
+        return MappingProxyType({_freeze(key): _freeze(value) for key, value in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_freeze(value) for value in obj)
+    if isinstance(obj, str):
+        # キーワードをキーとする出現数辞書の検索で同一オブジェクト比較が効くようにする
+        return sys.intern(obj)
+    return obj
+
+# 採点基準（全インスタンスで共有する読み取り専用の定義）
+_SCORING_CRITERIA = _freeze({
+    '経営状況分析の妥当性': {
+        'max_score': 25,
+        'weight': 0.25,
+        'sub_criteria': {
+            '企業概要の充実度': {'weight': 0.3, 'keywords': ['事業内容', '創業', '沿革', '従業員', '売上', '顧客']},
+            '売上・財務分析': {'weight': 0.3, 'keywords': ['売上高', '利益', '推移', '増減', '要因', '財務']},
+            '強み・弱み分析': {'weight': 0.25, 'keywords': ['強み', '弱み', '特徴', '優位性', '課題', '問題']},
+            '市場・競合認識': {'weight': 0.15, 'keywords': ['市場', '競合', '業界', '動向', 'ライバル', 'シェア']}
+        }
+    },
+    '経営方針・目標の適切性': {
+        'max_score': 25,
+        'weight': 0.25,
+        'sub_criteria': {
+            '経営方針の明確性': {'weight': 0.3, 'keywords': ['方針', '理念', 'ビジョン', '目標', '戦略']},
+            '数値目標の具体性': {'weight': 0.4, 'keywords': ['売上目標', '集客', '単価', '年度', '増加', '○○円', '○○人']},
+            '市場・顧客対応': {'weight': 0.2, 'keywords': ['顧客ニーズ', '市場動向', 'ターゲット', '需要']},
+            '実現可能性': {'weight': 0.1, 'keywords': ['計画', '段階', 'ステップ', '期間', '実施']}
+        }
+    },
+    '補助事業計画の有効性': {
+        'max_score': 30,
+        'weight': 0.3,
+        'sub_criteria': {
+            '事業計画の具体性': {'weight': 0.3, 'keywords': ['具体的', '詳細', '内容', '方法', '手順']},
+            '販路開拓の有効性': {'weight': 0.25, 'keywords': ['販路', '新規', '開拓', '顧客獲得', 'PR', '宣伝']},
+            '新規性・独自性': {'weight': 0.2, 'keywords': ['新たな', '独自', '他社にない', '差別化', '特色']},
+            'デジタル活用': {'weight': 0.15, 'keywords': ['デジタル', 'IT', 'ホームページ', 'SNS', 'システム', 'DX']},
+            '効果・成果予測': {'weight': 0.1, 'keywords': ['効果', '成果', '売上増', '集客増', '効率化']}
+        }
+    },
+    '積算の透明・適切性': {
+        'max_score': 20,
+        'weight': 0.2,
+        'sub_criteria': {
+            '経費明細の妥当性': {'weight': 0.4, 'keywords': ['経費', '明細', '内訳', '単価', '数量']},
+            '必要性の説明': {'weight': 0.3, 'keywords': ['必要', '理由', '根拠', '効果', '目的']},
+            '計算の正確性': {'weight': 0.2, 'keywords': ['合計', '計算', '金額', '×', '円']},
+            '補助対象適合性': {'weight': 0.1, 'keywords': ['補助対象', '対象経費', '適用']}
+        }
+    }
+})
+
+# 加点基準
+_BONUS_CRITERIA = _freeze({
+    'priority_bonus': {
+        '赤字賃上げ加点': {'keywords': ['赤字', '賃上げ', '賃金引上げ'], 'points': 5},
+        '事業環境変化加点': {'keywords': ['物価高騰', 'コロナ', '環境変化', '影響'], 'points': 5},
+        '東日本大震災加点': {'keywords': ['震災', '被災', '復興'], 'points': 3},
+        'くるみん・えるぼし加点': {'keywords': ['くるみん', 'えるぼし', '女性活躍'], 'points': 3}
+    },
+    'policy_bonus': {
+        '賃金引上げ加点': {'keywords': ['賃上げ', '30円', '時給', '昇給'], 'points': 3},
+        '地方創生型加点': {'keywords': ['地域資源', '地方創生', '地域活性化'], 'points': 3},
+        '経営力向上計画加点': {'keywords': ['経営力向上計画', '認定'], 'points': 2},
+        '事業承継加点': {'keywords': ['事業承継', '後継者', '60歳'], 'points': 3},
+        '過疎地域加点': {'keywords': ['過疎地域'], 'points': 2}
+    }
+})
+
+# 評価軸ごとの改善提案テンプレート
+_IMPROVEMENT_TEMPLATES = _freeze({
+    '経営状況分析の妥当性': {
+        'low_threshold': 18,
+        'improvements': [
+            {
+                'item': '企業概要の詳細化',
+                'current_issue': '事業内容や特徴の説明が不十分',
+                'improvement_method': '創業年、従業員数、主要商品・サービス、事業規模を具体的に記載',
+                'example': '「創業○年、従業員○名の○○業。主力商品は○○で、年間売上○○万円」'
             },
-            '経営方針・目標の適切性': {
-                'max_score': 25,
-                'weight': 0.25,
-                'sub_criteria': {
-                    '経営方針の明確性': {'weight': 0.3, 'keywords': ['方針', '理念', 'ビジョン', '目標', '戦略']},
-                    '数値目標の具体性': {'weight': 0.4, 'keywords': ['売上目標', '集客', '単価', '年度', '増加', '○○円', '○○人']},
-                    '市場・顧客対応': {'weight': 0.2, 'keywords': ['顧客ニーズ', '市場動向', 'ターゲット', '需要']},
-                    '実現可能性': {'weight': 0.1, 'keywords': ['計画', '段階', 'ステップ', '期間', '実施']}
-                }
+            {
+                'item': '売上・財務分析の強化',
+                'current_issue': '売上推移や財務状況の分析が表面的',
+                'improvement_method': '過去3年間の売上推移を表形式で示し、増減要因を具体的に分析',
+                'example': '「2022年:○○万円→2023年:○○万円→2024年:○○万円。増加要因は○○」'
             },
-            '補助事業計画の有効性': {
-                'max_score': 30,
-                'weight': 0.3,
-                'sub_criteria': {
-                    '事業計画の具体性': {'weight': 0.3, 'keywords': ['具体的', '詳細', '内容', '方法', '手順']},
-                    '販路開拓の有効性': {'weight': 0.25, 'keywords': ['販路', '新規', '開拓', '顧客獲得', 'PR', '宣伝']},
-                    '新規性・独自性': {'weight': 0.2, 'keywords': ['新たな', '独自', '他社にない', '差別化', '特色']},
-                    'デジタル活用': {'weight': 0.15, 'keywords': ['デジタル', 'IT', 'ホームページ', 'SNS', 'システム', 'DX']},
-                    '効果・成果予測': {'weight': 0.1, 'keywords': ['効果', '成果', '売上増', '集客増', '効率化']}
-                }
+            {
+                'item': '強み・弱みの明確化',
+                'current_issue': '自社の強み・弱みの分析が抽象的',
+                'improvement_method': '競合他社との比較を含めた客観的な強み・弱み分析',
+                'example': '「強み:他社にない○○技術、弱み:認知度不足(市場シェア○%)」'
+            }
+        ]
+    },
+    '経営方針・目標の適切性': {
+        'low_threshold': 18,
+        'improvements': [
+            {
+                'item': '数値目標の具体化',
+                'current_issue': '売上目標や集客目標が曖昧',
+                'improvement_method': '年度別の具体的な数値目標を表形式で設定',
+                'example': '「2025年:売上○○万円(前年比○%増)、新規顧客○○人獲得」'
             },
-            '積算の透明・適切性': {
-                'max_score': 20,
-                'weight': 0.2,
-                'sub_criteria': {
-                    '経費明細の妥当性': {'weight': 0.4, 'keywords': ['経費', '明細', '内訳', '単価', '数量']},
-                    '必要性の説明': {'weight': 0.3, 'keywords': ['必要', '理由', '根拠', '効果', '目的']},
-                    '計算の正確性': {'weight': 0.2, 'keywords': ['合計', '計算', '金額', '×', '円']},
-                    '補助対象適合性': {'weight': 0.1, 'keywords': ['補助対象', '対象経費', '適用']}
-                }
+            {
+                'item': '市場・顧客分析の深化',
+                'current_issue': 'ターゲット顧客や市場動向の分析が不足',
+                'improvement_method': '統計データを活用した市場規模・成長性・顧客特性の分析',
+                'example': '「○○市場規模○○億円、年成長率○%。主要顧客層は○○代○○」'
             }
-        }
-    
-    def _initialize_bonus_criteria(self) -> Dict[str, Any]:
-        """加点基準の初期化"""
-        return {
-            'priority_bonus': {
-                '赤字賃上げ加点': {'keywords': ['赤字', '賃上げ', '賃金引上げ'], 'points': 5},
-                '事業環境変化加点': {'keywords': ['物価高騰', 'コロナ', '環境変化', '影響'], 'points': 5},
-                '東日本大震災加点': {'keywords': ['震災', '被災', '復興'], 'points': 3},
-                'くるみん・えるぼし加点': {'keywords': ['くるみん', 'えるぼし', '女性活躍'], 'points': 3}
+        ]
+    },
+    '補助事業計画の有効性': {
+        'low_threshold': 22,
+        'improvements': [
+            {
+                'item': '事業計画の具体化',
+                'current_issue': '補助事業の内容や手順が抽象的',
+                'improvement_method': '実施時期、実施方法、担当者を含む詳細な実行計画',
+                'example': '「○月:ホームページ制作開始、○月:完成・公開、担当:○○」'
+            },
+            {
+                'item': '販路開拓効果の明確化',
+                'current_issue': '販路開拓による効果の予測が不明確',
+                'improvement_method': '新規顧客獲得数、売上増加額を具体的に予測',
+                'example': '「HP経由で月○○件の問い合わせ、○○万円の売上増を見込む」'
+            },
+            {
+                'item': 'デジタル活用の強化',
+                'current_issue': 'デジタル技術の活用が限定的',
+                'improvement_method': 'SNS、ECサイト、顧客管理システム等の具体的活用計画',
+                'example': '「Instagram活用で若年層開拓、月○○投稿で○○フォロワー獲得目標」'
+            }
+        ]
+    },
+    '積算の透明・適切性': {
+        'low_threshold': 15,
+        'improvements': [
+            {
+                'item': '経費明細の詳細化',
+                'current_issue': '経費の内訳や単価が不明確',
+                'improvement_method': '見積書を取得し、単価×数量の詳細な明細を作成',
+                'example': '「ホームページ制作 ○○円、保守費用 ○○円/年」'
             },
-            'policy_bonus': {
-                '賃金引上げ加点': {'keywords': ['賃上げ', '30円', '時給', '昇給'], 'points': 3},
-                '地方創生型加点': {'keywords': ['地域資源', '地方創生', '地域活性化'], 'points': 3},
-                '経営力向上計画加点': {'keywords': ['経営力向上計画', '認定'], 'points': 2},
-                '事業承継加点': {'keywords': ['事業承継', '後継者', '60歳'], 'points': 3},
-                '過疎地域加点': {'keywords': ['過疎地域'], 'points': 2}
+            {
+                'item': '必要性の根拠強化',
+                'current_issue': '各経費の必要性の説明が不十分',
+                'improvement_method': '各経費がなぜ必要か、どのような効果があるかを具体的に説明',
+                'example': '「○○導入により業務効率○%向上、年間○○時間削減効果」'
             }
+        ]
+    }
+})
+
+# 改善提案の判定閾値（評価軸の順に並べた配列）
+_IMP_ORDER = tuple(_IMPROVEMENT_TEMPLATES)
+_IMP_THRESHOLDS = np.array([_IMPROVEMENT_TEMPLATES[name]['low_threshold'] for name in _IMP_ORDER], dtype=np.float64)
+_IMP_CRITICAL = _IMP_THRESHOLDS * 0.7
+
+class SmallBusinessScoringEngine:
+    """小規模事業者持続化補助金の採点エンジン"""
+    
+    def __init__(self):
+        self.scoring_criteria = _SCORING_CRITERIA
+        self.bonus_criteria = _BONUS_CRITERIA
+        self._keyword_automaton = self._build_keyword_automaton()
+        self._build_score_arrays()
+        
+        # 加点項目ごとのキーワード集合（出現キーワードとの共通部分の有無だけで判定）
+        self._bonus_keyword_sets = {
+            bonus_name: frozenset(bonus_info['keywords'])
+            for bonus_group in self.bonus_criteria.values()
+            for bonus_name, bonus_info in bonus_group.items()
         }
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()  # 複数セッションで共有される場合の排他
+        
+    def _build_keyword_automaton(self) -> ahocorasick.Automaton:
+        """採点・加点の全キーワードと具体的な表現を1回の走査で数えるためのオートマトン構築"""
+        automaton = ahocorasick.Automaton()
+        for pattern in _CONCRETE_PATTERNS:
+            automaton.add_word(pattern, pattern)
+        for criterion_info in self.scoring_criteria.values():
+            for sub_info in criterion_info['sub_criteria'].values():
+                for keyword in sub_info['keywords']:
+                    automaton.add_word(keyword, keyword)
+        for bonus_group in self.bonus_criteria.values():
+            for bonus_info in bonus_group.values():
+                for keyword in bonus_info['keywords']:
+                    automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+    
+    def _build_score_arrays(self):
+        """サブ基準のキーワード・重み・配点を連続した配列（SoA）に展開"""
+        flat_keywords = []
+        kw_start = []
+        weights = []
+        max_scores = []
+        offsets = [0]
+        for criterion_info in self.scoring_criteria.values():
+            for sub_info in criterion_info['sub_criteria'].values():
+                kw_start.append(len(flat_keywords))
+                flat_keywords.extend(sub_info['keywords'])
+                weights.append(sub_info['weight'])
+            max_scores.append(criterion_info['max_score'])
+            offsets.append(len(weights))
+        
+        # 重みは元の辞書定義と同じ倍精度で保持（float32では採点結果が変わるため）
+        self._flat_keywords = tuple(flat_keywords)
+        self._sub_kw_start = np.array(kw_start, dtype=np.int64)
+        self._sub_kw_end = np.append(self._sub_kw_start[1:], len(flat_keywords))
+        self._sub_kw_lens = self._sub_kw_end - self._sub_kw_start
+        self._sub_weights = np.array(weights, dtype=np.float64)
+        self._max_scores = np.array(max_scores, dtype=np.float64)
+        self._criterion_offsets = tuple(offsets)
+    
+    def _count_keywords(self, text: str) -> Dict[str, int]:
+        """キーワードごとの出現数を集計"""
+        hit_counts = {}
+        for _, keyword in self._keyword_automaton.iter(text):
+            hit_counts[keyword] = hit_counts.get(keyword, 0) + 1
+        return hit_counts
     
     def score_application(self, document_analysis: Dict[str, Any], strict_mode: bool = True) -> Dict[str, Any]:
         """申請書の採点を実行"""
         try:
-            # 基礎審査
-            basic_check = self._check_basic_requirements(document_analysis)
-            
-            if not basic_check['passed']:
-                return {
-                    'total_score': 0,
-                    'evaluation_level': '不適格',
-                    'adoption_probability': 0,
-                    'basic_requirements_passed': False,
-                    'detailed_scores': {},
-                    'improvements': basic_check['improvements'],
-                    'bonus_points': 0,
-                    'error': '基礎審査で必須要件を満たしていません'
-                }
+            text_content = document_analysis.get('text_content', '')
             
-            # 計画審査
-            detailed_scores = self._score_detailed_criteria(document_analysis, strict_mode)
+            # 同一本文・同一モードの採点結果は前回の結果を再利用
+            cache_key = (hashlib.blake2b(text_content.encode('utf-8', 'surrogatepass'), digest_size=16).digest(), strict_mode)
             
-            # 加点審査
-            bonus_analysis = self._analyze_bonus_points(document_analysis)
-            bonus_points = bonus_analysis['total_points']
+            with self._cache_lock:
+                scores = self._cache.get(cache_key)
+                if scores is not None:
+                    self._cache.move_to_end(cache_key)
             
-            # 総合スコア計算
-            base_score = sum(score_info['score'] for score_info in detailed_scores.values())
-            total_score = min(100, base_score + bonus_points)
-            
-            # 厳格モードでの調整
-            if strict_mode:
-                total_score = self._apply_strict_adjustment(total_score, document_analysis)
-            
-            # 評価レベル決定
-            evaluation_level = self._determine_evaluation_level(total_score)
-            adoption_probability = self._calculate_adoption_probability(total_score, bonus_points)
+            if scores is None:
+                scores = self._score_document(document_analysis, text_content, strict_mode)
+                
+                with self._cache_lock:
+                    self._cache[cache_key] = scores
+                    if len(self._cache) > _SCORE_CACHE_SIZE:
+                        self._cache.popitem(last=False)
             
-            # 改善提案生成
-            improvements = self._generate_improvements(detailed_scores, document_analysis)
+            # キャッシュは採点結果のみを保持し、呼び出しごとに複製して採点日時を付与
+            result = copy.deepcopy(scores)
+            if result['basic_requirements_passed']:
+                result['analysis_timestamp'] = datetime.now().isoformat()
             
-            return {
-                'total_score': total_score,
-                'evaluation_level': evaluation_level,
-                'adoption_probability': adoption_probability,
-                'basic_requirements_passed': True,
-                'detailed_scores': detailed_scores,
-                'improvements': improvements,
-                'bonus_points': bonus_points,
-                'bonus_analysis': bonus_analysis,
-                'analysis_timestamp': datetime.now().isoformat()
-            }
+            return result
             
         except Exception as e:
             return {
@@ -134,6 +318,75 @@ class SmallBusinessScoringEngine:
                 'adoption_probability': 0
             }
     
+    def _score_document(self, document_analysis: Dict[str, Any], text_content: str, strict_mode: bool) -> Dict[str, Any]:
+        """基礎審査から改善提案までの採点処理本体"""
+        # 基礎審査
+        basic_check = self._check_basic_requirements(document_analysis)
+        
+        if not basic_check['passed']:
+            return {
+                'total_score': 0,
+                'evaluation_level': '不適格',
+                'adoption_probability': 0,
+                'basic_requirements_passed': False,
+                'detailed_scores': {},
+                'improvements': basic_check['improvements'],
+                'bonus_points': 0,
+                'error': '基礎審査で必須要件を満たしていません'
+            }
+        
+        # 本文の小文字化は1回だけ行い、以降の審査で共用
+        text_lower = text_content.lower()
+        
+        # キーワード出現数（小文字化した本文を1回だけ走査）
+        hit_counts = self._count_keywords(text_lower)
+        
+        # 数値表現の種類（具体性評価・文書品質・厳格モード調整・改善提案で共用）
+        numeric_flags = self._scan_numeric_flags(text_lower)
+        
+        # 計画審査
+        detailed_scores = self._score_detailed_criteria(text_lower, hit_counts, numeric_flags, strict_mode)
+        
+        # 加点審査
+        bonus_analysis = self._analyze_bonus_points(hit_counts)
+        bonus_points = bonus_analysis['total_points']
+        
+        # 総合スコア計算
+        base_score = sum(score_info['score'] for score_info in detailed_scores.values())
+        total_score = base_score + bonus_points
+        if total_score >= 100:
+            total_score = 100
+        
+        # 厳格モードでの調整
+        if strict_mode:
+            has_money_people = bool(numeric_flags & _MONEY_PEOPLE_MASK)
+            total_score = self._apply_strict_adjustment(total_score, len(text_content), has_money_people)
+        
+        # 評価レベル決定
+        evaluation_level = self._determine_evaluation_level(total_score)
+        adoption_probability = self._calculate_adoption_probability(total_score, bonus_points)
+        
+        # 改善提案生成
+        improvements = list(self._generate_improvements(detailed_scores, text_lower, numeric_flags))
+        
+        return {
+            'total_score': total_score,
+            'evaluation_level': evaluation_level,
+            'adoption_probability': adoption_probability,
+            'basic_requirements_passed': True,
+            'detailed_scores': detailed_scores,
+            'improvements': improvements,
+            'bonus_points': bonus_points,
+            'bonus_analysis': bonus_analysis
+        }
+    
+    def _scan_numeric_flags(self, text: str) -> int:
+        """本文中に現れた数値表現の種類をビットで集計"""
+        numeric_flags = 0
+        for match in _NUMERIC_SCAN.finditer(text):
+            numeric_flags |= _NUMERIC_BITS[match.lastgroup]
+        return numeric_flags
+    
     def _check_basic_requirements(self, document_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """基礎審査チェック"""
         issues = []
@@ -142,15 +395,8 @@ class SmallBusinessScoringEngine:
         text_content = document_analysis.get('text_content', '')
         
         # 必須項目チェック
-        required_items = [
-            ('企業概要', ['事業内容', '業種', '従業員']),
-            ('売上情報', ['売上', '売上高', '利益']),
-            ('経営方針', ['方針', '目標', '計画']),
-            ('補助事業計画', ['補助事業', '計画', '内容'])
-        ]
-        
-        for item_name, keywords in required_items:
-            if not any(keyword in text_content for keyword in keywords):
+        for item_name, pattern in _REQUIRED_PATTERNS:
+            if not pattern.search(text_content):
                 issues.append({
                     'item': f'{item_name}の記載不足',
                     'priority': '緊急',
@@ -162,95 +408,86 @@ class SmallBusinessScoringEngine:
         
         return {'passed': passed, 'improvements': issues}
     
-    def _score_detailed_criteria(self, document_analysis: Dict[str, Any], strict_mode: bool) -> Dict[str, Dict]:
+    def _score_detailed_criteria(self, text_lower: str, hit_counts: Dict[str, int], numeric_flags: int, strict_mode: bool) -> Dict[str, Dict]:
         """詳細な採点基準による評価"""
         detailed_scores = {}
-        text_content = document_analysis.get('text_content', '').lower()
         
-        for criterion_name, criterion_info in self.scoring_criteria.items():
-            max_score = criterion_info['max_score']
-            sub_scores = []
-            
-            for sub_name, sub_info in criterion_info['sub_criteria'].items():
-                # キーワードマッチング
-                keyword_matches = sum(1 for keyword in sub_info['keywords'] if keyword in text_content)
-                keyword_score = min(1.0, keyword_matches / len(sub_info['keywords']) * 1.5)
-                
-                # 文書品質評価
-                quality_score = self._evaluate_content_quality(text_content, sub_info['keywords'])
-                
-                # 具体性評価
-                specificity_score = self._evaluate_specificity(text_content, sub_info['keywords'])
-                
-                # サブスコア計算
-                sub_score = (keyword_score * 0.4 + quality_score * 0.3 + specificity_score * 0.3) * sub_info['weight']
-                sub_scores.append(sub_score)
-            
-            # 基準スコア計算
-            base_score = sum(sub_scores) * max_score
-            
-            # 厳格モード調整
-            if strict_mode:
-                base_score *= 0.8  # 20%厳格化
-            
+        # 文書品質・具体性はキーワードに依存しないため文書ごとに1回だけ評価
+        quality_score = self._evaluate_content_quality(text_lower, hit_counts, numeric_flags)
+        specificity_score = self._evaluate_specificity(numeric_flags)
+        
+        # キーワードごとの有無をサブ基準単位で集計
+        keyword_hits = np.fromiter(
+            (hit_counts.get(keyword, 0) > 0 for keyword in self._flat_keywords),
+            dtype=np.int64, count=len(self._flat_keywords)
+        )
+        kw_hits = np.add.reduceat(keyword_hits, self._sub_kw_start)
+        
+        offsets = self._criterion_offsets
+        
+        # 全サブ基準のサブスコアをまとめてベクトル演算
+        keyword_scores = np.minimum(1.0, kw_hits / self._sub_kw_lens * 1.5)
+        sub_score_array = (keyword_scores * 0.4 + quality_score * 0.3 + specificity_score * 0.3) * self._sub_weights
+        
+        # 基準スコアは評価軸ごとの区間を合計して事前確保した配列に格納
+        # （要素数8未満の.sum()は先頭から順に加算されるため従来と同じ値になる。np.add.reduceatは加算順が異なり端数が変わるため使わない）
+        criterion_score_array = np.empty(self._max_scores.shape[0])
+        for c in range(criterion_score_array.shape[0]):
+            criterion_score_array[c] = sub_score_array[offsets[c]:offsets[c + 1]].sum() * self._max_scores[c]
+        
+        # 厳格モード調整
+        if strict_mode:
+            criterion_score_array *= 0.8  # 20%厳格化
+    
+        sub_score_list = sub_score_array.tolist()
+        criterion_scores = criterion_score_array.tolist()
+        
+        for c, (criterion_name, criterion_info) in enumerate(self.scoring_criteria.items()):
             detailed_scores[criterion_name] = {
-                'score': round(base_score, 1),
-                'max_score': max_score,
-                'sub_scores': sub_scores
+                'score': round(criterion_scores[c], 1),
+                'max_score': criterion_info['max_score'],
+                'sub_scores': sub_score_list[offsets[c]:offsets[c + 1]]
             }
         
         return detailed_scores
     
-    def _evaluate_content_quality(self, text: str, keywords: List[str]) -> float:
+    def _evaluate_content_quality(self, text: str, hit_counts: Dict[str, int], numeric_flags: int) -> float:
         """コンテンツ品質の評価"""
         quality_score = 0.0
         
         # 文章量チェック
-        if len(text) > 500:
+        text_length = len(text)
+        if text_length > 500:
             quality_score += 0.2
-        if len(text) > 1000:
+        if text_length > 1000:
             quality_score += 0.2
         
         # 数値データの存在
-        if re.search(r'\d+[万億千百十]?円|\d+[万千百十]?人|\d+%|\d+年', text):
+        if numeric_flags & _NUMERIC_Q_MASK:
             quality_score += 0.3
         
         # 具体的な表現
-        concrete_patterns = ['具体的に', '詳細', '明確', '○○', 'について', 'により']
-        concrete_matches = sum(1 for pattern in concrete_patterns if pattern in text)
-        quality_score += min(0.3, concrete_matches / len(concrete_patterns))
+        concrete_matches = sum(1 for pattern in _CONCRETE_PATTERNS if hit_counts.get(pattern))
+        concrete_ratio = concrete_matches / len(_CONCRETE_PATTERNS)
+        quality_score += concrete_ratio if concrete_ratio < 0.3 else 0.3
         
-        return min(1.0, quality_score)
+        return quality_score if quality_score < 1.0 else 1.0
     
-    def _evaluate_specificity(self, text: str, keywords: List[str]) -> float:
+    def _evaluate_specificity(self, numeric_flags: int) -> float:
         """具体性の評価"""
-        specificity_score = 0.0
-        
-        # 数値の具体性
-        numeric_patterns = [
-            r'\d+年\d+月',  # 具体的な日付
-            r'\d+[万億千]円',  # 具体的な金額
-            r'\d+[万千]人',  # 具体的な人数
-            r'\d+%',  # 具体的な割合
-            r'\d+回',  # 具体的な回数
-        ]
-        
-        for pattern in numeric_patterns:
-            if re.search(pattern, text):
-                specificity_score += 0.2
-        
-        return min(1.0, specificity_score)
+        # 数値の具体性（検出された種類ごとに0.2）
+        specificity_score = 0.2 * (numeric_flags & _SPEC_MASK).bit_count()
+        return specificity_score if specificity_score < 1.0 else 1.0
     
-    def _analyze_bonus_points(self, document_analysis: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze_bonus_points(self, hit_counts: Dict[str, int]) -> Dict[str, Any]:
         """加点項目の分析"""
-        text_content = document_analysis.get('text_content', '').lower()
         total_points = 0
         priority_bonuses = []
         policy_bonuses = []
         
         # 重点政策加点
         for bonus_name, bonus_info in self.bonus_criteria['priority_bonus'].items():
-            eligible = any(keyword in text_content for keyword in bonus_info['keywords'])
+            eligible = not self._bonus_keyword_sets[bonus_name].isdisjoint(hit_counts)
             if eligible:
                 total_points += bonus_info['points']
             
@@ -263,7 +500,7 @@ class SmallBusinessScoringEngine:
         
         # 政策加点
         for bonus_name, bonus_info in self.bonus_criteria['policy_bonus'].items():
-            eligible = any(keyword in text_content for keyword in bonus_info['keywords'])
+            eligible = not self._bonus_keyword_sets[bonus_name].isdisjoint(hit_counts)
             if eligible:
                 total_points += bonus_info['points']
             
@@ -280,10 +517,8 @@ class SmallBusinessScoringEngine:
             'policy_bonuses': policy_bonuses
         }
     
-    def _apply_strict_adjustment(self, score: float, document_analysis: Dict[str, Any]) -> float:
+    def _apply_strict_adjustment(self, score: float, text_length: int, has_money_people: bool) -> float:
         """厳格モードでの調整"""
-        text_length = len(document_analysis.get('text_content', ''))
-        
         # 文章量による調整
         if text_length < 500:
             score *= 0.7
@@ -291,162 +526,57 @@ class SmallBusinessScoringEngine:
             score *= 0.85
         
         # 具体性による調整
-        text_content = document_analysis.get('text_content', '').lower()
-        if not re.search(r'\d+[万億千]円|\d+[万千]人', text_content):
+        if not has_money_people:
             score *= 0.9
         
         return round(score, 1)
     
     def _determine_evaluation_level(self, score: float) -> str:
         """評価レベルの決定"""
-        if score >= 80:
-            return '優秀'
-        elif score >= 65:
-            return '良好'
-        elif score >= 50:
-            return '普通'
-        elif score >= 35:
-            return '不十分'
-        else:
-            return '不適格'
+        return _EVAL_LABELS[bisect.bisect_right(_EVAL_THRESH, score)]
     
     def _calculate_adoption_probability(self, score: float, bonus_points: float) -> float:
         """採択可能性の計算"""
         # 基本確率
-        if score >= 80:
-            base_probability = 85
-        elif score >= 70:
-            base_probability = 70
-        elif score >= 60:
-            base_probability = 50
-        elif score >= 50:
-            base_probability = 30
-        else:
-            base_probability = 10
+        base_probability = _PROB_BASE[bisect.bisect_right(_PROB_THRESH, score)]
         
         # 加点による調整
         bonus_adjustment = bonus_points * 2
         
         # 最終確率
-        final_probability = min(95, base_probability + bonus_adjustment)
+        final_probability = base_probability + bonus_adjustment
+        if final_probability >= 95:
+            final_probability = 95
         
         return round(final_probability, 1)
     
-    def _generate_improvements(self, detailed_scores: Dict[str, Dict], document_analysis: Dict[str, Any]) -> List[Dict]:
-        """具体的な改善提案を生成"""
-        improvements = []
-        text_content = document_analysis.get('text_content', '').lower()
-        
-        # 各評価軸の改善提案
-        improvement_templates = {
-            '経営状況分析の妥当性': {
-                'low_threshold': 18,
-                'improvements': [
-                    {
-                        'item': '企業概要の詳細化',
-                        'current_issue': '事業内容や特徴の説明が不十分',
-                        'improvement_method': '創業年、従業員数、主要商品・サービス、事業規模を具体的に記載',
-                        'example': '「創業○年、従業員○名の○○業。主力商品は○○で、年間売上○○万円」'
-                    },
-                    {
-                        'item': '売上・財務分析の強化',
-                        'current_issue': '売上推移や財務状況の分析が表面的',
-                        'improvement_method': '過去3年間の売上推移を表形式で示し、増減要因を具体的に分析',
-                        'example': '「2022年:○○万円→2023年:○○万円→2024年:○○万円。増加要因は○○」'
-                    },
-                    {
-                        'item': '強み・弱みの明確化',
-                        'current_issue': '自社の強み・弱みの分析が抽象的',
-                        'improvement_method': '競合他社との比較を含めた客観的な強み・弱み分析',
-                        'example': '「強み:他社にない○○技術、弱み:認知度不足(市場シェア○%)」'
-                    }
-                ]
-            },
-            '経営方針・目標の適切性': {
-                'low_threshold': 18,
-                'improvements': [
-                    {
-                        'item': '数値目標の具体化',
-                        'current_issue': '売上目標や集客目標が曖昧',
-                        'improvement_method': '年度別の具体的な数値目標を表形式で設定',
-                        'example': '「2025年:売上○○万円(前年比○%増)、新規顧客○○人獲得」'
-                    },
-                    {
-                        'item': '市場・顧客分析の深化',
-                        'current_issue': 'ターゲット顧客や市場動向の分析が不足',
-                        'improvement_method': '統計データを活用した市場規模・成長性・顧客特性の分析',
-                        'example': '「○○市場規模○○億円、年成長率○%。主要顧客層は○○代○○」'
-                    }
-                ]
-            },
-            '補助事業計画の有効性': {
-                'low_threshold': 22,
-                'improvements': [
-                    {
-                        'item': '事業計画の具体化',
-                        'current_issue': '補助事業の内容や手順が抽象的',
-                        'improvement_method': '実施時期、実施方法、担当者を含む詳細な実行計画',
-                        'example': '「○月:ホームページ制作開始、○月:完成・公開、担当:○○」'
-                    },
-                    {
-                        'item': '販路開拓効果の明確化',
-                        'current_issue': '販路開拓による効果の予測が不明確',
-                        'improvement_method': '新規顧客獲得数、売上増加額を具体的に予測',
-                        'example': '「HP経由で月○○件の問い合わせ、○○万円の売上増を見込む」'
-                    },
-                    {
-                        'item': 'デジタル活用の強化',
-                        'current_issue': 'デジタル技術の活用が限定的',
-                        'improvement_method': 'SNS、ECサイト、顧客管理システム等の具体的活用計画',
-                        'example': '「Instagram活用で若年層開拓、月○○投稿で○○フォロワー獲得目標」'
-                    }
-                ]
-            },
-            '積算の透明・適切性': {
-                'low_threshold': 15,
-                'improvements': [
-                    {
-                        'item': '経費明細の詳細化',
-                        'current_issue': '経費の内訳や単価が不明確',
-                        'improvement_method': '見積書を取得し、単価×数量の詳細な明細を作成',
-                        'example': '「ホームページ制作 ○○円、保守費用 ○○円/年」'
-                    },
-                    {
-                        'item': '必要性の根拠強化',
-                        'current_issue': '各経費の必要性の説明が不十分',
-                        'improvement_method': '各経費がなぜ必要か、どのような効果があるかを具体的に説明',
-                        'example': '「○○導入により業務効率○%向上、年間○○時間削減効果」'
-                    }
-                ]
-            }
-        }
-        
-        # 各評価軸をチェックして改善提案を追加
-        for criterion_name, score_info in detailed_scores.items():
-            if criterion_name in improvement_templates:
-                template = improvement_templates[criterion_name]
-                if score_info['score'] < template['low_threshold']:
-                    for improvement in template['improvements']:
-                        improvement['priority'] = '重要' if score_info['score'] < template['low_threshold'] * 0.7 else '推奨'
-                        improvements.append(improvement)
+    def _generate_improvements(self, detailed_scores: Dict[str, Dict], text_lower: str, numeric_flags: int) -> Iterator[Dict]:
+        """具体的な改善提案を順に生成"""
+        # 基準を下回る評価軸の改善提案を追加（テンプレートは共有のため複製して優先度を付与）
+        scores = np.fromiter((detailed_scores[name]['score'] for name in _IMP_ORDER), dtype=np.float64, count=len(_IMP_ORDER))
+        below = scores < _IMP_THRESHOLDS
+        critical = scores < _IMP_CRITICAL
+        for criterion_name, is_below, is_critical in zip(_IMP_ORDER, below.tolist(), critical.tolist()):
+            if is_below:
+                priority = '重要' if is_critical else '推奨'
+                for improvement in _IMPROVEMENT_TEMPLATES[criterion_name]['improvements']:
+                    yield {**improvement, 'priority': priority}
         
         # 全体的な改善提案
-        if not re.search(r'\d+[万億千]円', text_content):
-            improvements.append({
+        if not numeric_flags & _MONEY_MASK:
+            yield {
                 'item': '数値データの充実',
                 'priority': '重要',
                 'current_issue': '具体的な金額や数量の記載が不足',
                 'improvement_method': '売上、経費、目標値等を具体的な数値で記載',
                 'example': '「現在の月商○○万円を○○万円に増加させる計画」'
-            })
+            }
         
-        if len(text_content) < 1000:
-            improvements.append({
+        if len(text_lower) < 1000:
+            yield {
                 'item': '記載内容の充実',
                 'priority': '推奨',
                 'current_issue': '全体的な記載量が不足している可能性',
                 'improvement_method': '各項目について、より詳細で具体的な内容を記載',
                 'example': '背景、現状、課題、解決策、効果を段階的に詳述'
-            })
-        
-        return improvements
\ No newline at end of file
+            }
\ No newline at end of file
@@ -0,0 +1,42 @@
+import time
+
+import pytest
+
+import small_business_analyzer
+from small_business_analyzer import SmallBusinessAnalyzer
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    return SmallBusinessAnalyzer()
+
+
+def test_ascii_keywords_ignore_english_words(analyzer):
+    """英単語の一部（product・with等）は英字キーワードとして検出しない"""
+    keyword_hits, _ = analyzer._scan_keywords("product price April with digital")
+    assert not keyword_hits & {'it', 'sns', 'dx', 'PR'}
+
+
+def test_ascii_keywords_match_standalone(analyzer):
+    """日本語に隣接する英字キーワードは大文字小文字を問わず検出"""
+    keyword_hits, _ = analyzer._scan_keywords("IT導入とSNSでのPR、dx推進")
+    assert {'it', 'sns', 'dx', 'PR'} <= keyword_hits
+
+
+@pytest.mark.parametrize("name, unit", [
+    ('_FINANCIAL_RE', '2024年あ'),
+    ('_FINANCIAL_RE', '売上あ'),
+    ('_EMP_RE', '従業員あ'),
+    ('_CAPITAL_RE', '資本金あ'),
+    ('_EST_RE', '設立あ'),
+    ('_MARKET_SIZE_RE', '市場あ'),
+    ('_NUMERICAL_TGT_RE', '売上あ'),
+    ('_EFFECT_RE', '効果あ'),
+])
+def test_patterns_on_long_single_line(name, unit):
+    """改行のない2万文字の行でもバックトラックで停止しない"""
+    text = (unit * (20000 // len(unit) + 1))[:20000]
+    start = time.perf_counter()
+    for _ in getattr(small_business_analyzer, name).finditer(text):
+        pass
+    assert time.perf_counter() - start < 1.0